@@ -4,61 +4,121 @@ from __future__ import annotations
 Run with: python main.py client <server_ip> [server_port]
 """
 
-import math
+import os
+import queue
+import selectors
 import socket
 import sys
 import threading
 import time
 import logging
-import re
-from dataclasses import dataclass
-from typing import Tuple, Optional
+from collections import deque
+from typing import Tuple
 
 import pygame
 import hashlib
-from copy import copy
 
 import config
+from net_batch import RecvBatch, SendBatch
 
 from protocol import (
     Hello,
-    Input,
     Login,
-    LoginResult,
     MessageType,
     Pulse,
     State,
-    Welcome,
     decode,
+    decode_state,
+    encode_input,
+    peek_type,
 )
 
-# Setup detailed logging
+# Setup detailed logging; set PONG_LOG_LEVEL=WARNING to silence the per-frame chatter
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=os.environ.get("PONG_LOG_LEVEL", "DEBUG").upper(),
     format='%(asctime)s [CLIENT] %(levelname)s: %(message)s',
     datefmt='%H:%M:%S'
 )
 logger = logging.getLogger('pong_client')
 
+# Event types the client reacts to; everything else is blocked at the SDL queue.
+_INPUT_EVENTS = [pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP]
+
+
 class Gui:
     """Handles rendering and input using pygame."""
 
-    def __init__(self, width: int = config.GAME_WIDTH, height: int = config.GAME_HEIGHT):
-        pygame.init()
+    # Attributes are touched every frame; slots keep their lookups off the instance dict
+    __slots__ = (
+        "width", "height", "paddle_height", "paddle_width", "ball_size", "screen",
+        "font", "username_font", "cached_usernames", "last_left_username",
+        "last_right_username", "_prev_rects", "_last_frame_key", "_up", "_down",
+        "_white", "_black", "_p0_rect", "_p1_rect", "_ball_rect", "_paddle_surf",
+        "_ball_surf", "_score_center_x", "_score_cache", "_wait_surf", "_wait_rect",
+        "_dot_surfs", "_dot_rects", "_assign_surf", "_assign_rect", "_connect_surf",
+        "_connect_rect", "_text_cache",
+    )
+
+    def __init__(self, width: int = config.GAME_WIDTH, height: int = config.GAME_HEIGHT,
+                 vsync: bool = config.UI_VSYNC):
+        # Only the subsystems we use; pygame.init() would also open the audio
+        # device and probe joysticks, slowing startup for nothing.
+        pygame.display.init()
+        pygame.font.init()
         self.width = width
         self.height = height
         self.paddle_height = config.PADDLE_HEIGHT # height of the paddle
         self.paddle_width = config.PADDLE_WIDTH # width of the paddle
         self.ball_size = config.BALL_SIZE # size of the ball
-        self.screen = pygame.display.set_mode((width, height))
+        self.screen = self._create_display(width, height, vsync)
         pygame.display.set_caption("UDP Pong")
-        self.clock = pygame.time.Clock()
-        pygame.font.init()
+        # Only materialize the events we consume; mouse motion, window and audio
+        # events are dropped inside SDL instead of becoming Python objects.
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(_INPUT_EVENTS)
+        pygame.key.set_repeat(0)  # held keys are tracked from KEYDOWN/KEYUP, not repeats
         self.font = pygame.font.Font(None, config.UI_DEFAULT_FONT_SIZE)
         self.username_font = pygame.font.Font(None, config.UI_LARGE_FONT_SIZE)  # Create font once
         self.cached_usernames = {}  # Cache for rotated username surfaces
         self.last_left_username = None
         self.last_right_username = None
+        self._prev_rects: list[pygame.Rect] | None = None  # regions drawn last game frame
+        self._last_frame_key: tuple | None = None  # what the screen currently shows
+        self._up = False  # arrow keys held, tracked from KEYDOWN/KEYUP events
+        self._down = False
+
+        # Static draw geometry; draw() only moves these rects
+        self._white = (255, 255, 255)
+        self._black = (0, 0, 0)
+        self._p0_rect = pygame.Rect(0, 0, self.paddle_width, self.paddle_height)
+        self._p1_rect = pygame.Rect(width - self.paddle_width, 0, self.paddle_width, self.paddle_height)
+        self._ball_rect = pygame.Rect(0, 0, self.ball_size, self.ball_size)
+        # Solid sprites blitted in one batch instead of rasterized with draw.rect
+        self._paddle_surf = pygame.Surface((self.paddle_width, self.paddle_height)).convert()
+        self._paddle_surf.fill(self._white)
+        self._ball_surf = pygame.Surface((self.ball_size, self.ball_size)).convert()
+        self._ball_surf.fill(self._white)
+        self._score_center_x = width // 2
+
+        # Score surfaces (with their rects) are rendered once per distinct score
+        self._score_cache: dict[tuple[int, int], tuple[pygame.Surface, pygame.Rect]] = {}
+
+        white = (255, 255, 255)
+        self._wait_surf = self._render_text("Waiting for an opponent...", white)
+
+        # Waiting screens are redrawn every frame for as long as the wait lasts,
+        # so their text surfaces and centered rects are built once here.
+        center = (width // 2, height // 2)
+        self._wait_rect = self._wait_surf.get_rect(center=center)
+        self._dot_surfs = [self._render_text("." * n, white) for n in (1, 2, 3)]
+        self._dot_rects = [surf.get_rect(center=(width // 2, height // 2 + 40)) for surf in self._dot_surfs]
+        self._assign_surf = self._render_text("Waiting for game to assign a player ID...", white)
+        self._assign_rect = self._assign_surf.get_rect(center=center)
+        self._connect_surf = self._render_text("Connecting to game server...", white)
+        self._connect_rect = self._connect_surf.get_rect(center=center)
+
+        # Other status text is rendered on first use and then reused
+        self._text_cache: dict[tuple, pygame.Surface] = {}
 
     def _get_rotated_username_surface(self, username: str, is_left: bool) -> pygame.Surface:
         """Get a cached rotated username surface or create a new one."""
@@ -68,119 +128,190 @@ class Gui:
         
         # Create new surface if not in cache
         username_surface = self.username_font.render(username, True, (128, 128, 128))
-        rotated_surface = pygame.transform.rotate(username_surface, 90 if is_left else -90)
+        rotated_surface = pygame.transform.rotate(username_surface, 90 if is_left else -90).convert_alpha()
         self.cached_usernames[cache_key] = rotated_surface
         return rotated_surface
 
-    def poll_input(self) -> float | None:
-        """Return new paddle y position based on user input, or None if unchanged."""
-        dy = 0
-        for event in pygame.event.get():
+    def pump_events(self) -> list:
+        """Fetch this frame's input events from SDL. Called once per frame; handlers share the list."""
+        return pygame.event.get(_INPUT_EVENTS)
+
+    def poll_input(self, events: list) -> float | None:
+        """Return the paddle delta for this frame's ``events``, or None if unchanged."""
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit(0)
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_UP]:
-            dy = -config.UI_PADDLE_SPEED
-        elif keys[pygame.K_DOWN]:
-            dy = config.UI_PADDLE_SPEED
-        if dy == 0:
-            return None
-        return dy
-
-    def draw(self, state: State, player_id: int, local_paddle_y: float | None = None, left_username: str | None = None, right_username: str | None = None):
-        white = (255, 255, 255)
-        black = (0, 0, 0)
-        self.screen.fill(black)
+            self.track_key(event)
+        direction = self._down - self._up  # bools: -1, 0 or 1; both held cancel out
+        return direction * config.UI_PADDLE_SPEED if direction else None
+
+    def track_key(self, event: pygame.event.Event) -> None:
+        """Update held-key flags from a KEYDOWN/KEYUP event (cheaper than get_pressed())."""
+        if event.type == pygame.KEYDOWN or event.type == pygame.KEYUP:
+            held = event.type == pygame.KEYDOWN
+            if event.key == pygame.K_UP:
+                self._up = held
+            elif event.key == pygame.K_DOWN:
+                self._down = held
 
-        # Derive paddle positions with optional local override (prediction) without
-        # mutating the authoritative State instance.
+    def draw(self, state: State, player_id: int, local_paddle_y: float | None = None, left_username: str | None = None, right_username: str | None = None,
+             remote_paddle_y: float | None = None, ball_pos: Tuple[float, float] | None = None):
+        black = self._black
+        screen = self.screen
+
+        # A username change (or a screen drawn elsewhere) needs a full repaint;
+        # otherwise only the regions covered last frame are cleared.
+        if left_username != self.last_left_username or right_username != self.last_right_username:
+            self.last_left_username = left_username
+            self.last_right_username = right_username
+            self._prev_rects = None
+        prev_rects = self._prev_rects
+        full_redraw = prev_rects is None
+
+        # Derive positions with optional overrides (local prediction, remote
+        # interpolation, grace-period ball) without mutating or copying the
+        # authoritative State instance.
         paddle0_y = state.paddle0_y
         paddle1_y = state.paddle1_y
-        if local_paddle_y is not None:
-            if player_id == 0:
+        if player_id == 0:
+            if local_paddle_y is not None:
                 paddle0_y = local_paddle_y
-            elif player_id == 1:
+            if remote_paddle_y is not None:
+                paddle1_y = remote_paddle_y
+        elif player_id == 1:
+            if local_paddle_y is not None:
                 paddle1_y = local_paddle_y
+            if remote_paddle_y is not None:
+                paddle0_y = remote_paddle_y
+        self._p0_rect.y = paddle0_y
+        self._p1_rect.y = paddle1_y
+        ball = self._ball_rect
+        if ball_pos is None:
+            ball.x = state.ball_x
+            ball.y = state.ball_y
+        else:
+            ball.x, ball.y = ball_pos
 
-        # Draw paddles
-        pygame.draw.rect(self.screen, white, (0, paddle0_y, 10, 60))
-        pygame.draw.rect(
-            self.screen,
-            white,
-            (self.width - 10, paddle1_y, 10, 60),
-        )
-
-        # Draw scores at the top center
-        score_text = f"{state.score0} : {state.score1}"
-        text_surface = self.font.render(score_text, True, white)
-        text_rect = text_surface.get_rect(center=(self.width // 2, 20))
-        self.screen.blit(text_surface, text_rect)
-
-        # Draw usernames if available
+        # Skip the frame entirely when nothing moved by a whole pixel
+        # (e.g. the countdown before the ball is served)
+        frame_key = (self._p0_rect.y, self._p1_rect.y, ball.x, ball.y, state.score0, state.score1)
+        if not full_redraw and frame_key == self._last_frame_key:
+            return
+        self._last_frame_key = frame_key
+
+        if full_redraw:
+            screen.fill(black)
+        else:
+            for rect in prev_rects:
+                screen.fill(black, rect)
+
+        # Usernames are static: blit them on a full repaint, or when last frame's
+        # clearing touched them (the ball passed over one).
         if left_username:
-            # Only create/get surface if username changed
-            if left_username != self.last_left_username:
-                self.last_left_username = left_username
-            
-            # Get cached surface and draw it
             rotated_surface = self._get_rotated_username_surface(left_username, True)
             username_rect = rotated_surface.get_rect(midleft=(20, self.height // 2))
-            self.screen.blit(rotated_surface, username_rect)
+            if full_redraw or username_rect.collidelist(prev_rects) >= 0:
+                screen.blit(rotated_surface, username_rect)
 
         if right_username:
-            # Only create/get surface if username changed
-            if right_username != self.last_right_username:
-                self.last_right_username = right_username
-            
-            # Get cached surface and draw it
             rotated_surface = self._get_rotated_username_surface(right_username, False)
             username_rect = rotated_surface.get_rect(midright=(self.width - 20, self.height // 2))
-            self.screen.blit(rotated_surface, username_rect)
+            if full_redraw or username_rect.collidelist(prev_rects) >= 0:
+                screen.blit(rotated_surface, username_rect)
+
+        # Paddles, ball and score go out in a single blits() call
+        score_surf, score_rect = self._score_surface(state.score0, state.score1)
+        screen.blits([
+            (score_surf, score_rect),
+            (self._paddle_surf, self._p0_rect),
+            (self._paddle_surf, self._p1_rect),
+            (self._ball_surf, ball),
+        ], doreturn=False)
+
+        # Copies: the sprite rects are moved again next frame
+        paddle0_rect = self._p0_rect.copy()
+        paddle1_rect = self._p1_rect.copy()
+        ball_rect = ball.copy()
 
-        # Draw ball
-        pygame.draw.rect(
-            self.screen,
-            white,
-            (state.ball_x, state.ball_y, self.ball_size, self.ball_size),
-        )
+        # Present only what changed since the previous frame
+        new_rects = [paddle0_rect, paddle1_rect, ball_rect, score_rect]
+        if full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(prev_rects + new_rects)
+        self._prev_rects = new_rects
 
-        # Flip
+    def flip(self):
+        """Present the whole screen; the next game frame then repaints fully."""
         pygame.display.flip()
-        self.clock.tick(60)
+        self._prev_rects = None
+        self._last_frame_key = None
+
+    def _score_surface(self, score0: int, score1: int) -> tuple[pygame.Surface, pygame.Rect]:
+        """Return the "score0 : score1" surface and its rect, rendering only on a cache miss."""
+        key = (score0, score1)
+        cached = self._score_cache.get(key)
+        if cached is None:
+            if len(self._score_cache) > 32:
+                self._score_cache.clear()
+            surf = self._render_text(f"{score0} : {score1}", self._white)
+            cached = self._score_cache[key] = (surf, surf.get_rect(center=(self._score_center_x, 20)))
+        return cached
+
+    @staticmethod
+    def _create_display(width: int, height: int, vsync: bool) -> pygame.Surface:
+        """Open the window. Frames are paced by the client's deadline loop, so VSync is opt-in."""
+        try:
+            # SCALED presents through an SDL renderer (GPU-backed where available);
+            # it is also the only path on which SDL honours vsync.
+            return pygame.display.set_mode(
+                (width, height), pygame.SCALED | pygame.DOUBLEBUF, vsync=1 if vsync else 0)
+        except pygame.error as e:
+            logger.warning("Accelerated display unavailable (%s), using a software window", e)
+        return pygame.display.set_mode((width, height), pygame.DOUBLEBUF)
 
     # ------------------ login helpers ------------------ #
     def _text_input_loop(self, prompt: str, is_password: bool = False) -> str:
-        """Display a text input field and return the entered string."""
+        """Display a text input field and return the entered string.
+
+        Blocks in SDL until an event arrives; the text surface is re-rendered only
+        when the entered text changes.
+        """
         text = ""
+        white = (255, 255, 255)
+        rendered_prompt = self.font.render(prompt, True, white)  # constant for this call
+        rendered_text = self.font.render("", True, white)
+        changed = False
         while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit(0)
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN:
-                        return text
-                    elif event.key == pygame.K_BACKSPACE:
-                        text = text[:-1]
-                    elif event.key == pygame.K_ESCAPE:
-                        pygame.quit()
-                        sys.exit(0)
-                    else:
-                        if event.unicode and event.key < 256:
-                            text += event.unicode
+            if changed:
+                display_text = "*" * len(text) if is_password else text
+                rendered_text = self.font.render(display_text, True, white)
+                changed = False
 
-            # draw prompt
             self.screen.fill((0, 0, 0))
-            rendered_prompt = self.font.render(prompt, True, (255, 255, 255))
             self.screen.blit(rendered_prompt, (20, self.height // 3))
-
-            display_text = "*" * len(text) if is_password else text
-            rendered_text = self.font.render(display_text, True, (255, 255, 255))
             self.screen.blit(rendered_text, (20, self.height // 3 + 40))
+            self.flip()
 
-            pygame.display.flip()
-            self.clock.tick(30)
+            # Timeout only so the window is re-presented now and then while idle
+            event = pygame.event.wait(500)
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit(0)
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_RETURN:
+                    return text
+                elif event.key == pygame.K_BACKSPACE:
+                    changed = bool(text)
+                    text = text[:-1]
+                elif event.key == pygame.K_ESCAPE:
+                    pygame.quit()
+                    sys.exit(0)
+                else:
+                    if event.unicode and event.key < 256:
+                        text += event.unicode
+                        changed = True
 
     def login_screen(self) -> str:
         """Handle login / account creation. Returns authenticated username."""
@@ -191,12 +322,28 @@ class Gui:
             # Return credentials to be validated by server
             return username, password
 
+    def _render_cached(self, text: str, color: tuple = (255, 255, 255),
+                       font: pygame.font.Font | None = None) -> pygame.Surface:
+        """Render text once and reuse the surface (oldest entries evicted past 128)."""
+        font = font or self.font
+        key = (text, color, id(font))
+        surf = self._text_cache.get(key)
+        if surf is None:
+            if len(self._text_cache) >= 128:
+                del self._text_cache[next(iter(self._text_cache))]
+            surf = self._text_cache[key] = self._render_text(text, color, font)
+        return surf
+
+    def _render_text(self, text: str, color: tuple, font: pygame.font.Font | None = None) -> pygame.Surface:
+        """Render antialiased text converted to the display format, for surfaces that get reused."""
+        return (font or self.font).render(text, True, color).convert_alpha()
+
     def _show_message(self, text: str, pause: float = config.MESSAGE_DISPLAY_TIME):
         self.screen.fill((0, 0, 0))
-        rendered = self.font.render(text, True, (255, 255, 255))
+        rendered = self._render_cached(text)
         rect = rendered.get_rect(center=(self.width // 2, self.height // 2))
         self.screen.blit(rendered, rect)
-        pygame.display.flip()
+        self.flip()
         pygame.time.delay(int(pause * 1000))
 
     def show_game_over(self, reason: str, player_stats: dict = None) -> None:
@@ -204,8 +351,7 @@ class Gui:
         self.screen.fill((0, 0, 0))
         
         # Main message - larger font for title
-        title_font = pygame.font.Font(None, config.UI_LARGE_FONT_SIZE)
-        rendered = title_font.render("Game Over", True, (255, 255, 255))
+        rendered = self._render_cached("Game Over", font=self.username_font)
         rect = rendered.get_rect(center=(self.width // 2, self.height // 4))
         self.screen.blit(rendered, rect)
         
@@ -220,7 +366,7 @@ class Gui:
         else:
             msg = reason
             
-        rendered = self.font.render(msg, True, (255, 255, 255))
+        rendered = self._render_cached(msg)
         rect = rendered.get_rect(center=(self.width // 2, y_offset))
         self.screen.blit(rendered, rect)
         
@@ -249,7 +395,7 @@ class Gui:
             # Render each line separately
             line_height = 30
             for line in stats_lines:
-                rendered = self.font.render(line, True, stats_color)
+                rendered = self._render_cached(line, stats_color)
                 rect = rendered.get_rect(center=(self.width // 2, y_offset))
                 self.screen.blit(rendered, rect)
                 y_offset += line_height
@@ -257,51 +403,99 @@ class Gui:
             y_offset += 20  # Extra space after stats
         
         # Exit prompt
-        rendered = self.font.render("Press any key to exit", True, (200, 200, 200))
+        rendered = self._render_cached("Press any key to exit", (200, 200, 200))
         rect = rendered.get_rect(center=(self.width // 2, self.height * 3 // 4))
         self.screen.blit(rendered, rect)
         
-        pygame.display.flip()
+        self.flip()
         
-        # Wait for keypress or quit
+        # Wait for keypress or quit (blocking in SDL rather than spinning)
         waiting = True
         while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    waiting = False
-                elif event.type == pygame.KEYDOWN:
-                    waiting = False
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                waiting = False
+            elif event.type == pygame.KEYDOWN:
+                waiting = False
         
         pygame.quit()
         sys.exit(0)
 
     def show_waiting_for_opponent(self):
         """Show a message indicating the player is waiting for an opponent."""
+        # Animation phase; the screen is only redrawn when the dot count changes
+        t = time.time() * 2  # Animation speed
+        n = int(t % 3)
+        frame_key = ("waiting", n)
+        if frame_key == self._last_frame_key:
+            return
+
         self.screen.fill((0, 0, 0))
         
         # Main message
-        rendered = self.font.render("Waiting for an opponent...", True, (255, 255, 255))
-        rect = rendered.get_rect(center=(self.width // 2, self.height // 2))
-        self.screen.blit(rendered, rect)
+        self.screen.blit(self._wait_surf, self._wait_rect)
         
         # Draw a simple animation to show activity
-        t = time.time() * 2  # Animation speed
-        dots = "." * (1 + int(t % 3))
-        rendered = self.font.render(dots, True, (255, 255, 255))
-        rect = rendered.get_rect(center=(self.width // 2, self.height // 2 + 40))
-        self.screen.blit(rendered, rect)
+        self.screen.blit(self._dot_surfs[n], self._dot_rects[n])
         
-        pygame.display.flip()
-        self.clock.tick(10)  # Lower framerate while waiting
+        self.flip()
+        self._last_frame_key = frame_key
+
+    def show_waiting_for_player_id(self, in_lobby: bool):
+        """Show the connecting / waiting-for-player-ID screen."""
+        frame_key = ("player_id", in_lobby)
+        if frame_key == self._last_frame_key:
+            return  # static screen, already shown
+        self.screen.fill((0, 0, 0))
+        # Different message depending on connection state
+        if in_lobby:
+            self.screen.blit(self._assign_surf, self._assign_rect)
+        else:
+            self.screen.blit(self._connect_surf, self._connect_rect)
+        self.flip()
+        self._last_frame_key = frame_key
 
 
 class PongClient:
+    __slots__ = (
+        # socket and send/receive plumbing
+        "server_addr", "sock", "_rx", "_sendto", "_tx", "_out", "_frame_events",
+        "_payload_username", "_hello_bytes", "_pulse_bytes", "_frame_deadline", "_sel",
+        # session and lobby state
+        "seq", "player_id", "state", "gui", "username", "password_hash", "authenticated",
+        "last_auth_attempt", "last_hello_attempt", "hello_sent", "waiting_for_opponent",
+        "pulse_to_server_time", "pulse_from_server_time", "opponent_username",
+        "lobby_id", "in_lobby", "lobby_server_addr",
+        # grace period, prediction and interpolation
+        "grace_period", "last_ball_pos", "physics_started", "_last_sent_paddle_y",
+        "_last_send_ts", "_paddle_max_y", "_sim_dt", "_sim_speed_scale", "_sim_max_acc",
+        "_sim_acc", "_sim_last", "_pending_inputs", "_snapshots",
+        # network thread hand-off
+        "_latest_state", "_consumed_state", "_inbox", "_net_running", "_net_thread",
+    )
+
     def __init__(self, server_addr: Tuple[str, int], gui: Gui):
         logger.info(f"Initializing client connecting to {server_addr}")
-        self.server_addr = server_addr
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self.sock.setblocking(False)
+        self.server_addr = self._resolve(server_addr)
+        # Non-blocking from creation where the platform supports it (Linux)
+        nonblock = getattr(socket, "SOCK_NONBLOCK", 0)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM | nonblock)
+        if not nonblock:
+            self.sock.setblocking(False)
+        self._tune_socket(self.sock)
         logger.debug("Created non-blocking UDP socket")
+        self._rx = RecvBatch(self.sock)  # preallocated batch receive buffers
+        self._sendto = self.sock.sendto  # bound once; send() runs at the input rate
+        self._tx = SendBatch(self.sock)  # main-loop sends are flushed together via sendmmsg
+        self._out: list[bytes] = []
+        self._frame_events: list = []  # pygame events fetched for the current frame
+        # HELLO/PULSE only depend on the username, so their bytes are reused
+        self._payload_username: str | None = None
+        self._hello_bytes = b""
+        self._pulse_bytes = b""
+        self._frame_deadline = time.perf_counter()  # when the current frame should end
+        self._sel = selectors.DefaultSelector()  # epoll on Linux
+        self._sel.register(self.sock, selectors.EVENT_READ)
         self.seq = 0
         self.player_id = -1
         self.state: State | None = None
@@ -328,45 +522,205 @@ class PongClient:
         self.grace_period = True  # Assume we start in grace period
         self.last_ball_pos = None  # Track last ball position
         self.physics_started = False  # Flag to track when physics actually starts
+        self._last_sent_paddle_y: float | None = None  # paddle_y carried by the last INPUT
+        self._last_send_ts = 0.0  # perf_counter() of the last INPUT
+        self._paddle_max_y = gui.height - gui.paddle_height  # lowest valid paddle top
+        # Fixed-timestep simulation; UI_PADDLE_SPEED is per render frame, so scale it per step
+        self._sim_dt = 1.0 / config.CLIENT_SIM_RATE
+        self._sim_speed_scale = config.CLIENT_TARGET_FPS / config.CLIENT_SIM_RATE
+        self._sim_max_acc = config.CLIENT_SIM_MAX_STEPS * self._sim_dt
+        self._sim_acc = 0.0
+        self._sim_last = time.perf_counter()
+        # Prediction: INPUTs the server has not acknowledged yet, as (seq, paddle_y)
+        self._pending_inputs: deque[tuple[int, float]] = deque(maxlen=64)
+        # Interpolation: recent (arrival time, State) pairs, enough to span INTERP_DELAY
+        self._snapshots: deque[tuple[float, State]] = deque(
+            maxlen=int(config.INTERP_DELAY * config.TICK_RATE) + 4)
+
+        # Background receiver: decodes packets off the render thread, publishes the
+        # newest STATE in a single slot and queues every other message in order.
+        self._latest_state: tuple[float, State] | None = None  # (arrival time, State)
+        self._consumed_state: tuple[float, State] | None = None
+        self._inbox: queue.SimpleQueue = queue.SimpleQueue()
+        self._net_running = False
+        self._net_thread = threading.Thread(target=self._net_loop, name="pong-net", daemon=True)
         
         logger.debug("Client initialized with default state")
 
     # ------------- networking helpers ------------- #
+    @staticmethod
+    def _resolve(addr: Tuple[str, int]) -> Tuple[str, int]:
+        """Resolve the host once so sendto() never has to go through getaddrinfo."""
+        try:
+            return (socket.gethostbyname(addr[0]), addr[1])
+        except OSError as e:
+            logger.error("Could not resolve %s: %s", addr[0], e)
+            return addr
+
+    @staticmethod
+    def _tune_socket(sock: socket.socket):
+        """Enlarge the receive buffer and mark packets as low-delay (best effort)."""
+        options = [
+            (socket.SOL_SOCKET, socket.SO_RCVBUF, config.SOCKET_RCVBUF),
+            (socket.SOL_SOCKET, socket.SO_SNDBUF, config.SOCKET_SNDBUF),
+            (socket.IPPROTO_IP, getattr(socket, "IP_TOS", None), config.SOCKET_TOS),
+            (socket.SOL_SOCKET, getattr(socket, "SO_PRIORITY", None), config.SOCKET_PRIORITY),
+        ]
+        for level, option, value in options:
+            if option is None:
+                continue  # not available on this platform
+            try:
+                sock.setsockopt(level, option, value)
+            except OSError as e:
+                logger.warning("setsockopt(%s=%s) failed: %s", option, value, e)
+
     def send(self, msg):
         """Send a message to the current server (either main or lobby)."""
         target_addr = self.lobby_server_addr if self.in_lobby else self.server_addr
-        logger.debug(f"Sending {msg.__class__.__name__} packet to {'lobby' if self.in_lobby else 'main'} server at {target_addr}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sending %s packet to %s server at %s", msg.__class__.__name__,
+                         "lobby" if self.in_lobby else "main", target_addr)
         try:
-            self.sock.sendto(msg.encode(), target_addr)
+            self._sendto(msg.encode(), target_addr)
             self.pulse_to_server_time = time.perf_counter()
         except Exception as e:
-            logger.error(f"Failed to send {msg.__class__.__name__} packet: {e}")
+            logger.error("Failed to send %s packet: %s", msg.__class__.__name__, e)
+
+    def _send_raw(self, payload: bytes):
+        """Send already-encoded bytes to the current server."""
+        target_addr = self.lobby_server_addr if self.in_lobby else self.server_addr
+        try:
+            self._sendto(payload, target_addr)
+            self.pulse_to_server_time = time.perf_counter()
+        except Exception as e:
+            logger.error("Failed to send packet: %s", e)
+
+    def _hello_payload(self) -> bytes:
+        """Encoded HELLO for the current username, built once per username."""
+        if self._payload_username != self.username:
+            self._cache_identity_payloads()
+        return self._hello_bytes
+
+    def _pulse_payload(self) -> bytes:
+        """Encoded PULSE for the current username, built once per username."""
+        if self._payload_username != self.username:
+            self._cache_identity_payloads()
+        return self._pulse_bytes
+
+    def _cache_identity_payloads(self):
+        self._hello_bytes = Hello(username=self.username).encode()
+        self._pulse_bytes = Pulse(username=self.username).encode()
+        self._payload_username = self.username
+
+    def queue_send(self, msg):
+        """Queue a message for the next _flush_sends() (main thread only)."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Queueing %s packet", msg.__class__.__name__)
+        self._out.append(msg.encode())
+
+    def _flush_sends(self):
+        """Send every queued packet to the current server in one batch."""
+        if not self._out:
+            return
+        target_addr = self.lobby_server_addr if self.in_lobby else self.server_addr
+        try:
+            self._tx.send(self._out, target_addr)
+            self.pulse_to_server_time = time.perf_counter()
+        except Exception as e:
+            logger.error("Failed to send %d queued packet(s): %s", len(self._out), e)
+        self._out.clear()
 
     def _recv_packets(self):
-        """Process all available packets in the UDP receive buffer."""
-        latest = None
-        count = 0
-        while count < 30:  # Process at most 30 packets per frame to prevent indefinite loops
+        """Decode all available packets in the UDP receive buffer and publish them."""
+        try:
+            batch = self._rx.recv()  # one recvmmsg syscall on Linux
+        except Exception as e:
+            logger.error("Error receiving packet: %s", e)
+            return False
+        if not batch:
+            return False
+        # ALWAYS update pulse time for ANY packet from server (once per batch)
+        now = time.perf_counter()  # one clock read per batch, shared by every packet in it
+        self.pulse_from_server_time = now
+        # Only the newest STATE in a burst matters; older ones are skipped before
+        # decoding. Every other message is published in arrival order. Packets are
+        # decoded straight from the batch views: decoded messages hold no reference
+        # to the buffers, so nothing is copied out of them.
+        types = [peek_type(view) for view, _addr in batch]
+        newest_state = -1
+        for i, mtype in enumerate(types):
+            if mtype == MessageType.STATE:
+                newest_state = i
+        for i, (view, _addr) in enumerate(batch):
+            if types[i] == MessageType.STATE:
+                if i == newest_state:
+                    self._publish_state(view, now)
+            else:
+                self._publish_packet(view, now)
+        return True  # at least one packet was received
+
+    def _publish_state(self, raw, now: float):
+        """Decode a binary STATE straight through the fast path and store it as the latest."""
+        try:
+            msg = decode_state(raw)
+        except ValueError as e:
+            logger.error("Failed to decode packet: %s", e)
+            return
+        self._latest_state = (now, msg)  # newer states replace older ones
+
+    def _publish_packet(self, raw, now: float | None = None):
+        """Decode a packet on the network thread and hand it to the main thread."""
+        try:
+            msg = decode(raw)
+        except ValueError as e:
+            logger.error("Failed to decode packet: %s", e)
+            return
+        if msg.type == MessageType.STATE:
+            self._latest_state = (time.perf_counter() if now is None else now, msg)  # newer states replace older ones
+        else:
+            self._inbox.put(msg)
+
+    def _net_loop(self):
+        """Network thread body: wait for the socket to become readable, then drain it."""
+        while self._net_running:
             try:
-                raw, addr = self.sock.recvfrom(4096)
-                latest = raw
-                self._handle_packet(latest)
-                count += 1
-            except BlockingIOError:
-                break
-            except Exception as e:
-                logger.error(f"Error receiving packet: {e}")
+                ready = self._sel.select(timeout=0.1)
+            except (OSError, ValueError):
+                break  # socket closed
+            if ready:
+                self._recv_packets()  # only drain when the kernel says data is queued
+
+    def _start_network_thread(self):
+        """Hand socket reads to the background thread (after authentication)."""
+        if not self._net_running:
+            self._net_running = True
+            self._net_thread.start()
+
+    def _dispatch_received(self):
+        """Handle messages published by the network thread. Main thread only."""
+        handled = False
+        while True:
+            try:
+                msg = self._inbox.get_nowait()
+            except queue.Empty:
                 break
-        return count > 0  # Return True if at least one packet was received
+            self._handle_message(msg)
+            handled = True
+
+        stamped = self._latest_state
+        if stamped is not None and stamped is not self._consumed_state:
+            self._consumed_state = stamped
+            self._handle_message(stamped[1], recv_time=stamped[0])
+            handled = True
+        return handled
 
     def _handle_redirect(self, reason: str) -> bool:
         """Handle server redirect messages.
         Returns True if redirect was handled, False otherwise."""
-        # Parse redirect message format: "redirect:port:lobby_id"
-        redirect_match = re.match(r"redirect:(\d+):(\d+)", reason)
-        if redirect_match:
-            port_str, lobby_id_str = redirect_match.groups()
+        # Parse redirect message format: "redirect:port:lobby_id" (fixed, so no regex)
+        if reason.startswith("redirect:"):
             try:
+                _, port_str, lobby_id_str = reason.split(":", 2)
                 new_port = int(port_str)
                 new_lobby_id = int(lobby_id_str)
                 
@@ -379,19 +733,18 @@ class PongClient:
                 self.state = None    # Reset game state
                 self.hello_sent = False  # Need to send HELLO to new lobby
                 
-                logger.info(f"Redirecting to lobby {new_lobby_id} at {host}:{new_port}")
+                logger.info("Redirecting to lobby %s at %s:%s", new_lobby_id, host, new_port)
                 self.gui._show_message(f"Joining game lobby {new_lobby_id}...", pause=0.5)
                 
                 # Send HELLO to the new lobby immediately
-                logger.info(f"Sending HELLO to lobby with username {self.username}")
-                hello = Hello(username=self.username)
-                self.send(hello)
+                logger.info("Sending HELLO to lobby with username %s", self.username)
+                self._send_raw(self._hello_payload())
                 self.hello_sent = True
                 self.last_hello_attempt = time.perf_counter()
                 
                 return True
             except ValueError:
-                logger.error(f"Invalid redirect format: {reason}")
+                logger.error("Invalid redirect format: %s", reason)
                 return False
         
         # Handle waiting_for_opponent message
@@ -402,18 +755,10 @@ class PongClient:
             
         return False  # Not a redirect message
 
-    def _handle_packet(self, raw):
-        try:
-            msg = decode(raw)
-            # ALWAYS update pulse time for ANY packet from server
-            self.pulse_from_server_time = time.perf_counter()
-        except ValueError as e:
-            logger.error(f"Failed to decode packet: {e}")
-            return
-        
+    def _handle_message(self, msg, recv_time: float | None = None):
         if msg.type == MessageType.WELCOME:
             self.player_id = msg.player_id  # type: ignore[attr-defined]
-            logger.info(f"Assigned player_id={self.player_id}")
+            logger.info("Assigned player_id=%d", self.player_id)
             # Reset hello state once WELCOME is received
             self.hello_sent = False
             self.waiting_for_opponent = False
@@ -423,6 +768,7 @@ class PongClient:
             self.grace_period = True
             self.last_ball_pos = None
             self.physics_started = False
+            self._snapshots.clear()  # don't interpolate from a previous game
 
         elif msg.type == MessageType.STATE:
             
@@ -434,7 +780,7 @@ class PongClient:
                 self.last_ball_pos = current_pos
             elif self.grace_period and self.last_ball_pos != current_pos:
                 # Ball position changed - physics has started
-                logger.info(f"Detected physics start: ball moved from {self.last_ball_pos} to {current_pos}")
+                logger.info("Detected physics start: ball moved from %s to %s", self.last_ball_pos, current_pos)
                 self.grace_period = False
                 self.physics_started = True
             
@@ -443,6 +789,14 @@ class PongClient:
                 
             # Update state
             self.state = msg  # type: ignore[assignment]
+            t = time.perf_counter() if recv_time is None else recv_time
+            self._snapshots.append((t, msg))
+
+            # Drop inputs the server has now applied
+            ack = msg.ack0 if self.player_id == 0 else msg.ack1  # type: ignore[attr-defined]
+            pending = self._pending_inputs
+            while pending and pending[0][0] <= ack:
+                pending.popleft()
             
             # Update opponent's username from state message
             if self.player_id == 0:
@@ -459,11 +813,11 @@ class PongClient:
             
             # If not a redirect, show error and exit
             reason = getattr(msg, 'reason', 'duplicate user')
-            logger.warning(f"Received DENIED message: {reason}")
+            logger.warning("Received DENIED message: %s", reason)
             
             # Special case: If server asks for re-authentication, try to re-login instead of exiting
             if reason == "authentication required" and self.username and self.password_hash:
-                logger.info(f"Re-authentication required. Attempting to reconnect...")
+                logger.info("Re-authentication required. Attempting to reconnect...")
                 self.gui._show_message("Session expired. Reconnecting...", pause=0.5)
                 
                 # Reset state
@@ -474,14 +828,14 @@ class PongClient:
                 
                 # Re-authenticate
                 login_msg = Login(username=self.username, password_hash=self.password_hash)
-                self.send(login_msg)
+                self.queue_send(login_msg)
                 self.last_auth_attempt = time.perf_counter()
                 logger.info("Sent re-authentication request")
                 return
             
             # For other denial reasons, exit the game
             self.gui._show_message(f"Login denied: {reason}", pause=2)
-            logger.error(f"Login denied: {reason}")
+            logger.error("Login denied: %s", reason)
             pygame.quit()
             sys.exit(1)
 
@@ -489,19 +843,18 @@ class PongClient:
             # This is now handled in handle_auth() during the authentication phase
             # Only handle it here if we're in the main loop (re-authentication scenario)
             if not self.authenticated and msg.success:  # type: ignore[attr-defined]
-                logger.info(f"Re-authentication successful")
+                logger.info("Re-authentication successful")
                 self.authenticated = True
                 
-                # Send HELLO immediately after re-authentication
-                hello = Hello(username=self.username)
-                self.send(hello)
+                # Send HELLO with this frame's batch after re-authentication
+                self._out.append(self._hello_payload())
                 self.hello_sent = True
                 self.last_hello_attempt = time.perf_counter()
                 logger.debug("Sent HELLO after re-authentication")
                 
         elif msg.type == MessageType.GAME_OVER:
             # Handle game over (opponent disconnected, etc.)
-            logger.info(f"Game over: {msg.reason}")  # type: ignore[attr-defined]
+            logger.info("Game over: %s", msg.reason)  # type: ignore[attr-defined]
             
             # Extract player statistics and other information
             player_stats = {
@@ -515,7 +868,7 @@ class PongClient:
                 'player_losses': getattr(msg, 'player_losses', 0)
             }
             
-            logger.info(f"Player stats: {player_stats}")
+            logger.info("Player stats: %s", player_stats)
             self.gui.show_game_over(msg.reason, player_stats)  # type: ignore[attr-defined]
             self.opponent_username = None  # Reset opponent username on game over
 
@@ -524,126 +877,128 @@ class PongClient:
         """Handle authentication and return False when completed to exit the loop."""
         logger.debug("In handle_auth() loop")
         # Process events
-        for event in pygame.event.get():
+        for event in self.gui.pump_events():
             if event.type == pygame.QUIT:
                 logger.info("Quit event received during auth")
                 pygame.quit()
                 sys.exit(0)
+            self.gui.track_key(event)  # a key held through login still moves the paddle
         
         # Already authenticated in a previous iteration?
         if self.authenticated:
             logger.debug("Already authenticated, exiting auth loop")
             return False  # Exit the authentication loop
         
-        # Drain network to process responses
-        packets_received = 0
-        while packets_received < config.MAX_PACKETS_PER_FRAME:
+        # Drain network to process responses (one batched receive)
+        try:
+            batch = self._rx.recv()
+        except Exception as e:
+            logger.error("Error receiving packet during auth: %s", e)
+            batch = []
+        now = time.perf_counter()  # one clock read for this auth iteration
+        for i, (view, addr) in enumerate(batch):
             try:
-                raw, addr = self.sock.recvfrom(config.UDP_BUFFER_SIZE)
-                try:
-                    msg = decode(raw)
-                    logger.info(f"Auth: Received {msg.__class__.__name__} packet from {addr}")
-                    
-                    # Handle authentication-related messages directly here
-                    if msg.type == MessageType.LOGIN_RESULT:
-                        if msg.success:  # type: ignore[attr-defined]
-                            logger.info(f"Login successful: {msg.message}")  # type: ignore[attr-defined]
-                            self.gui._show_message(f"Login successful: {msg.message}", pause=0.5)  # type: ignore[attr-defined]
-                            self.authenticated = True
-                            logger.debug("Set authenticated=True")
-                           
-                            # Send HELLO immediately after authentication
-                            logger.info(f"Sending HELLO immediately after auth with username {self.username}")
-                            hello = Hello(username=self.username)
-                            self.send(hello)
-                            self.hello_sent = True
-                            self.last_hello_attempt = time.perf_counter()
-                            logger.debug(f"Set hello_sent=True, last_hello_attempt={self.last_hello_attempt}")
-                            
-                            # Exit the auth loop on success
-                            return False
-                        else:
-                            logger.error(f"Login failed: {msg.message}")  # type: ignore[attr-defined]
-                            self.gui._show_message(f"Login failed: {msg.message}", pause=2.0)  # type: ignore[attr-defined]
-                            
-                            # Retry or exit
-                            if "Error:" in msg.message:  # type: ignore[attr-defined]
-                                # Server error, likely a critical issue
-                                logger.error(f"Critical server error: {msg.message}")  # type: ignore[attr-defined]
-                                pygame.quit()
-                                sys.exit(1)
-                            
-                            # For other errors, we'll retry with a new login
-                            self.last_auth_attempt = time.perf_counter() - config.AUTH_RETRY_INTERVAL  # Force retry soon
-                    else:
-                        # Let the regular handler take care of other messages
-                        self._handle_packet(raw)
-                except ValueError as e:
-                    logger.error(f"Failed to decode packet during auth: {e}")
-                
-                packets_received += 1
-            except BlockingIOError:
-                break
-            except Exception as e:
-                logger.error(f"Error receiving packet during auth: {e}")
-                break
+                msg = decode(view)
+            except ValueError as e:
+                logger.error("Failed to decode packet during auth: %s", e)
+                continue
+            logger.info("Auth: Received %s packet from %s", msg.__class__.__name__, addr)
+
+            # Handle authentication-related messages directly here
+            if msg.type == MessageType.LOGIN_RESULT:
+                if msg.success:  # type: ignore[attr-defined]
+                    logger.info("Login successful: %s", msg.message)  # type: ignore[attr-defined]
+                    self.gui._show_message(f"Login successful: {msg.message}", pause=0.5)  # type: ignore[attr-defined]
+                    self.authenticated = True
+                    logger.debug("Set authenticated=True")
+
+                    # Send HELLO immediately after authentication
+                    logger.info("Sending HELLO immediately after auth with username %s", self.username)
+                    self._send_raw(self._hello_payload())
+                    self.hello_sent = True
+                    self.last_hello_attempt = now
+                    logger.debug("Set hello_sent=True, last_hello_attempt=%s", self.last_hello_attempt)
+
+                    # The batch buffers are reused by the next receive, so decode any
+                    # packets that arrived behind LOGIN_RESULT for the main loop now.
+                    for rest, _addr in batch[i + 1:]:
+                        self._publish_packet(rest)
+
+                    # Exit the auth loop on success
+                    return False
+                else:
+                    logger.error("Login failed: %s", msg.message)  # type: ignore[attr-defined]
+                    self.gui._show_message(f"Login failed: {msg.message}", pause=2.0)  # type: ignore[attr-defined]
+
+                    # Retry or exit
+                    if "Error:" in msg.message:  # type: ignore[attr-defined]
+                        # Server error, likely a critical issue
+                        logger.error("Critical server error: %s", msg.message)  # type: ignore[attr-defined]
+                        pygame.quit()
+                        sys.exit(1)
+
+                    # For other errors, we'll retry with a new login
+                    self.last_auth_attempt = now - config.AUTH_RETRY_INTERVAL  # Force retry soon
+            else:
+                # Let the regular handler take care of other messages
+                self.pulse_from_server_time = now
+                self._handle_message(msg)
             
         # Display "connecting" screen
         self.gui.screen.fill((0, 0, 0))
-        wait_msg = self.gui.font.render("Connecting to server...", True, (255, 255, 255))
+        wait_msg = self.gui._render_cached("Connecting to server...")
         rect = wait_msg.get_rect(center=(self.gui.width // 2, self.gui.height // 2))
         self.gui.screen.blit(wait_msg, rect)
         
         # Retry login periodically
-        if time.perf_counter() - self.last_auth_attempt > config.AUTH_RETRY_INTERVAL and self.username and self.password_hash:
-            logger.info(f"Retrying LOGIN with username {self.username}")
+        if now - self.last_auth_attempt > config.AUTH_RETRY_INTERVAL and self.username and self.password_hash:
+            logger.info("Retrying LOGIN with username %s", self.username)
             login_msg = Login(username=self.username, password_hash=self.password_hash)
-            self.send(login_msg)
-            self.last_auth_attempt = time.perf_counter()
-            logger.debug(f"Updated last_auth_attempt={self.last_auth_attempt}")
+            self.queue_send(login_msg)
+            self.last_auth_attempt = now
+            logger.debug("Updated last_auth_attempt=%s", self.last_auth_attempt)
         
-        pygame.display.flip()
-        self.gui.clock.tick(30)
+        self.gui.flip()
+        self._flush_sends()  # LOGIN retry and anything queued by handled messages
+        self._wait_for_next_frame(1.0 / config.CLIENT_AUTH_FPS, wake_on_packet=True)
         
         # Continue authentication loop
         return True
 
-    def _send_heartbeat(self):
+    def _send_heartbeat(self, now: float):
         """Send periodic heartbeat messages to keep connection alive."""
-        time_since_pulse = time.perf_counter() - self.pulse_to_server_time
+        time_since_pulse = now - self.pulse_to_server_time
         if time_since_pulse > config.HEARTBEAT_INTERVAL:
             # If we're authenticated but not in a lobby, or we're in a lobby but not yet assigned a player ID,
             # send a HELLO to help with reconnection
             if self.authenticated and (not self.in_lobby or self.player_id == -1):
                 # It's been longer than normal between messages, try sending HELLO instead of PULSE
-                logger.info(f"Sending HELLO as heartbeat (username={self.username})")
-                hello = Hello(username=self.username)
-                self.send(hello)
+                logger.info("Sending HELLO as heartbeat (username=%s)", self.username)
+                self._out.append(self._hello_payload())
                 self.hello_sent = True
-                self.last_hello_attempt = time.perf_counter()
+                self.last_hello_attempt = now
             else:
                 # Normal pulse
-                pulse = Pulse(username=self.username)
-                self.send(pulse)
-                logger.info(f"Sending PULSE to keep connection alive")
+                self._out.append(self._pulse_payload())
+                logger.info("Sending PULSE to keep connection alive")
             
-            self.pulse_to_server_time = time.perf_counter()
+            self.pulse_to_server_time = now
     
-    def _check_server_timeout(self):
+    def _check_server_timeout(self, now: float):
         """Check if server has been unresponsive for too long."""
-        elapsed = time.perf_counter() - self.pulse_from_server_time
+        elapsed = now - self.pulse_from_server_time
         
         # Different thresholds based on connection state
         if elapsed > config.CLIENT_SERVER_TIMEOUT:
             # Hard timeout - exit the game
-            logger.error(f"Server not responding for {elapsed:.1f} seconds, quitting")
+            logger.error("Server not responding for %.1f seconds, quitting", elapsed)
             self.gui.show_game_over("Server not responding... shutting down")
             time.sleep(2)
             pygame.quit()
             sys.exit(1)
         elif elapsed > config.CLIENT_SERVER_WARNING and self.authenticated:
             # Try resetting connection to main server
-            logger.warning(f"Server unresponsive for {elapsed:.1f} seconds, attempting reconnection")
+            logger.warning("Server unresponsive for %.1f seconds, attempting reconnection", elapsed)
             
             # Reset lobby state if we were in one
             if self.in_lobby:
@@ -655,44 +1010,31 @@ class PongClient:
                 self.waiting_for_opponent = False
                 
                 # Send HELLO to main server to try reconnecting
-                hello = Hello(username=self.username)
-                self.send(hello)
+                self._send_raw(self._hello_payload())
                 self.hello_sent = True
-                self.last_hello_attempt = time.perf_counter()
+                self.last_hello_attempt = now
                 
                 # Reset timeout counter to give reconnection a chance
-                self.pulse_from_server_time = time.perf_counter() - 2.0  # Give 6 more seconds
+                self.pulse_from_server_time = now - 2.0  # Give 6 more seconds
                 
                 # Show a message to the user
                 self.gui._show_message("Connection issue, attempting to reconnect...", pause=1.0)
             
-    def _handle_waiting_for_player_id(self):
+    def _handle_waiting_for_player_id(self, now: float):
         """Handle state when waiting for server to assign a player ID."""
         # Retry HELLO if needed
         if self.authenticated and self.player_id == -1 and self.username:
-            time_since_hello = time.perf_counter() - self.last_hello_attempt
-            logger.debug(f"Time since last HELLO: {time_since_hello:.1f}s")
+            time_since_hello = now - self.last_hello_attempt
+            logger.debug("Time since last HELLO: %.1fs", time_since_hello)
             if time_since_hello > config.HELLO_RETRY_INTERVAL:
-                logger.info(f"Retrying HELLO with username {self.username}")
-                hello = Hello(username=self.username)
-                self.send(hello)
-                self.last_hello_attempt = time.perf_counter()
-                logger.debug(f"Updated last_hello_attempt={self.last_hello_attempt}")
+                logger.info("Retrying HELLO with username %s", self.username)
+                self._out.append(self._hello_payload())
+                self.last_hello_attempt = now
+                logger.debug("Updated last_hello_attempt=%s", self.last_hello_attempt)
         
         # Draw waiting screen
-        self.gui.screen.fill((0, 0, 0))
-        
-        # Different message depending on connection state
-        if self.in_lobby:
-            wait_msg = self.gui.font.render("Waiting for game to assign a player ID...", True, (255, 255, 255))
-        else:
-            wait_msg = self.gui.font.render("Connecting to game server...", True, (255, 255, 255))
-        
-        rect = wait_msg.get_rect(center=(self.gui.width // 2, self.gui.height // 2))
-        self.gui.screen.blit(wait_msg, rect)
         self._handle_events()
-        pygame.display.flip()
-        self.gui.clock.tick(60)
+        self.gui.show_waiting_for_player_id(self.in_lobby)
     
     def _handle_waiting_for_opponent(self):
         """Handle state when waiting for another player to join."""
@@ -700,15 +1042,58 @@ class PongClient:
         self.gui.show_waiting_for_opponent()
         self._handle_events()
     
-    def _handle_active_game(self, last_paddle_y):
-        """Handle state when game is active with both players."""
-        dy = self.gui.poll_input()
+    def _handle_active_game(self, last_paddle_y, now):
+        """Handle state when game is active with both players.
+
+        Input and prediction advance in fixed CLIENT_SIM_RATE steps, however
+        long the frame took; the frame is then rendered once.
+        """
+        dy = self.gui.poll_input(self._frame_events)
+
+        acc = self._sim_acc + (now - self._sim_last)
+        self._sim_acc = acc if acc < self._sim_max_acc else self._sim_max_acc  # no catch-up spiral
+        self._sim_last = now
+        while self._sim_acc >= self._sim_dt:
+            last_paddle_y = self._tick_simulation(last_paddle_y, dy, now)
+            self._sim_acc -= self._sim_dt
+        self._flush_sends()  # before drawing and waiting for the next frame
+
+        self._render_game(last_paddle_y, now)
+        return last_paddle_y
+
+    def _tick_simulation(self, last_paddle_y, dy, now):
+        """One fixed step: move the local paddle, reconcile, and send INPUT if due."""
         if dy is not None:
-            last_paddle_y = max(0, min(self.gui.height - 60, last_paddle_y + dy))
-            inp = Input(seq=self.seq, paddle_y=last_paddle_y)
+            y = last_paddle_y + dy * self._sim_speed_scale
+            pm = self._paddle_max_y
+            last_paddle_y = 0 if y < 0 else (pm if y > pm else y)
+
+        # Reconcile: once every INPUT has been acknowledged and no local move is
+        # waiting to be sent, the server's paddle is authoritative. This also picks
+        # up server-side resets such as paddles re-centering for a new game.
+        state = self.state
+        if not self._pending_inputs and last_paddle_y == self._last_sent_paddle_y:
+            last_paddle_y = state.paddle0_y if self.player_id == 0 else state.paddle1_y
+            self._last_sent_paddle_y = last_paddle_y
+
+        # Coalesce inputs: only the newest paddle position matters, so send at most
+        # one INPUT per interval. A pending change is flushed once the interval passes.
+        # INPUT carries an absolute position, so a lost packet is repaired by
+        # re-sending the current one.
+        since_send = now - self._last_send_ts
+        if ((last_paddle_y != self._last_sent_paddle_y and since_send >= config.INPUT_SEND_INTERVAL)
+                or (self._pending_inputs and since_send >= config.INPUT_RESEND_INTERVAL)):
+            self._pending_inputs.append((self.seq, last_paddle_y))
+            self._out.append(encode_input(self.seq, last_paddle_y))  # no Input object on this path
             self.seq += 1
-            self.send(inp)
-        
+            self._last_sent_paddle_y = last_paddle_y
+            self._last_send_ts = now
+        return last_paddle_y
+
+    def _render_game(self, last_paddle_y, now):
+        """Draw the current frame of an active game."""
+        state = self.state
+
         # Determine which username goes on which side
         if self.player_id == 0:
             left_username = self.username
@@ -717,27 +1102,97 @@ class PongClient:
             left_username = self.opponent_username
             right_username = self.username
         
-        # Create a modified state for rendering during grace period
-        render_state = self.state
         if self.grace_period and not self.physics_started:
-            # During grace period, create a copy of state with centered ball
-            render_state = copy(self.state)
-            # Center the ball exactly
-            render_state.ball_x = self.gui.width / 2 - self.gui.ball_size / 2
-            render_state.ball_y = self.gui.height / 2 - self.gui.ball_size / 2
+            # During grace period, show the ball exactly centered
+            remote_paddle_y = None
+            ball_pos = (self.gui.width / 2 - self.gui.ball_size / 2,
+                        self.gui.height / 2 - self.gui.ball_size / 2)
+        else:
+            ball_x, ball_y, remote_paddle_y = self._interpolated_positions(
+                state, now - config.INTERP_DELAY)
+            ball_pos = (ball_x, ball_y)
         
-        self.gui.draw(render_state, self.player_id, local_paddle_y=last_paddle_y, 
-                     left_username=left_username, right_username=right_username)
-        return last_paddle_y
-    
+        self.gui.draw(state, self.player_id, local_paddle_y=last_paddle_y, 
+                     left_username=left_username, right_username=right_username,
+                     remote_paddle_y=remote_paddle_y, ball_pos=ball_pos)
+
+    def _interpolated_positions(self, state: State, render_time: float) -> Tuple[float, float, float]:
+        """Return ``(ball_x, ball_y, remote_paddle_y)`` as of ``render_time``.
+
+        Positions are interpolated between the two snapshots bracketing
+        render_time; past the newest one the ball is dead-reckoned from its
+        velocity (capped), and the remote paddle holds still.
+        """
+        older = newer = None
+        for snap in self._snapshots:
+            if snap[0] <= render_time:
+                older = snap
+            else:
+                newer = snap
+                break
+
+        remote_attr = "paddle1_y" if self.player_id == 0 else "paddle0_y"
+        if older is None:
+            # Not enough history yet: show the oldest snapshot we have
+            base = state if newer is None else newer[1]
+            return base.ball_x, base.ball_y, getattr(base, remote_attr)
+        if newer is None:
+            t0, s0 = older
+            dt = min(render_time - t0, config.BALL_EXTRAPOLATION_LIMIT)
+            y = s0.ball_y + s0.ball_vy * dt
+            max_y = self.gui.height - self.gui.ball_size
+            y = 0 if y < 0 else (max_y if y > max_y else y)
+            return s0.ball_x + s0.ball_vx * dt, y, getattr(s0, remote_attr)
+
+        t0, s0 = older
+        t1, s1 = newer
+        a = (render_time - t0) / (t1 - t0) if t1 > t0 else 1.0
+        if s0.score0 != s1.score0 or s0.score1 != s1.score1:
+            # The ball was re-centered after a point; don't sweep it across the field
+            base = s0 if a < 0.5 else s1
+            ball_x, ball_y = base.ball_x, base.ball_y
+        else:
+            ball_x = s0.ball_x + (s1.ball_x - s0.ball_x) * a
+            ball_y = s0.ball_y + (s1.ball_y - s0.ball_y) * a
+        p0 = getattr(s0, remote_attr)
+        return ball_x, ball_y, p0 + (getattr(s1, remote_attr) - p0) * a
+
     def _handle_events(self):
-        """Process pygame events."""
-        for event in pygame.event.get():
+        """Process this frame's pygame events (fetched once per loop iteration in run())."""
+        for event in self._frame_events:
             if event.type == pygame.QUIT:
                 logger.info("Quit event received")
                 pygame.quit()
                 sys.exit(0)
+            self.gui.track_key(event)  # keep held keys right across waiting screens
     
+    def _wait_for_next_frame(self, interval: float, wake_on_packet: bool = False):
+        """Sleep until the next frame deadline, then spin out the last sub-millisecond.
+
+        Deadlines advance by a fixed interval, so the time spent handling one frame
+        does not push every later frame back. A loop that falls more than a frame
+        behind restarts from now instead of bursting to catch up.
+
+        With ``wake_on_packet`` the sleep is a selector wait on the socket and
+        returns as soon as a datagram arrives. Only for loops that read the socket
+        themselves (before the network thread starts).
+        """
+        now = time.perf_counter()
+        deadline = self._frame_deadline + interval
+        if deadline < now - interval:
+            deadline = now
+        self._frame_deadline = deadline
+
+        remaining = deadline - now - config.FRAME_SPIN_MARGIN
+        if remaining > 0:
+            if wake_on_packet:
+                if self._sel.select(timeout=remaining):
+                    return
+            else:
+                time.sleep(remaining)
+        while time.perf_counter() < deadline:
+            pass
+
     # ------------- main loop ------------- #
     def run(self):
         # Authentication state
@@ -751,48 +1206,49 @@ class PongClient:
         logger.info("Authentication successful, entering main game loop")
         # Update server pulse time on successful auth to prevent immediate timeout
         self.pulse_from_server_time = time.perf_counter()
+        self._start_network_thread()
         
         # Now that we're connected and authenticated, start the main game loop
         last_paddle_y = self.gui.height / 2 - 30
         
         # Main game loop with consistent frame timing
-        target_fps = config.CLIENT_TARGET_FPS
-        frame_time_target = 1.0 / target_fps
+        frame_time_target = 1.0 / config.CLIENT_TARGET_FPS
+        waiting_frame_time = 1.0 / config.CLIENT_WAITING_FPS
         
         try:
             while True:
-                loop_start = time.perf_counter()
-                
-                # Network handling
-                packets_received = self._recv_packets()
-                
-                self._check_server_timeout()
-                self._send_heartbeat()
+                # Drain the SDL queue exactly once per frame; handlers use this list
+                self._frame_events = self.gui.pump_events()
+
+                # Network handling (packets are received on the network thread)
+                packets_received = self._dispatch_received()
+
+                # One clock read per frame; every handler below works from it
+                now = time.perf_counter()
+                self._check_server_timeout(now)
+                self._send_heartbeat(now)
                 
                 # State handling
+                frame_interval = frame_time_target
                 if self.state:
                     # Active game state
-                    last_paddle_y = self._handle_active_game(last_paddle_y)
+                    last_paddle_y = self._handle_active_game(last_paddle_y, now)
                 else:
                     # Waiting state
                     if self.waiting_for_opponent: #WAITING IN LOBBY
                         # Still in matchmaking
                         self._handle_waiting_for_opponent()
+                        frame_interval = waiting_frame_time  # Lower framerate while waiting
                     elif self.player_id == -1: #WAITING FOR PLAYER ID ASSIGNMENT
                         # Waiting for player ID assignment
-                        self._handle_waiting_for_player_id()
+                        self._handle_waiting_for_player_id(now)
                     else:
                         # Waiting for game to start
                         self._handle_waiting_for_opponent()
+                        frame_interval = waiting_frame_time
+                self._flush_sends()  # heartbeat/HELLO queued this frame
                 
-                # Calculate how much time to sleep to maintain target framerate
-                elapsed = time.perf_counter() - loop_start
-                sleep_time = max(0, frame_time_target - elapsed)
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
-                
-                # Log frame time
-                frame_time = time.perf_counter() - loop_start
+                self._wait_for_next_frame(frame_interval)
                     
         except Exception as e:
             logger.error(f"Error in main loop: {e}")
@@ -804,13 +1260,17 @@ class PongClient:
             sys.exit(1)
 
     def _hash_password(self, password: str) -> str:
-        """Hash a password using SHA-256 before sending it over the network."""
+        """Hash a password using SHA-256 before sending it over the network.
+
+        The digest is computed once at login and kept in ``password_hash`` for every
+        retry and reconnect. It stays SHA-256: accounts on the server are keyed by it.
+        """
         return hashlib.sha256(password.encode()).hexdigest()
 
 
-def run_client_main(server_ip: str, port: int = config.SERVER_PORT):
+def run_client_main(server_ip: str, port: int = config.SERVER_PORT, vsync: bool = config.UI_VSYNC):
     logger.info(f"Starting client connecting to {server_ip}:{port}")
-    gui = Gui()
+    gui = Gui(vsync=vsync)
     client = PongClient((server_ip, port), gui=gui)
     
     # Get login credentials
@@ -819,6 +1279,7 @@ def run_client_main(server_ip: str, port: int = config.SERVER_PORT):
     
     # Hash the password before sending
     password_hash = client._hash_password(password)
+    del password  # only the hash is needed from here on
     logger.debug("Password hashed for security")
     
     # Send login request
@@ -10,6 +10,11 @@ LOBBY_PORT_RANGE = (10000, 20000)  # Range of ports to use for game lobbies
 MAX_LOBBIES = 50  # Maximum number of concurrent game lobbies
 MAX_PACKETS_PER_FRAME = 30  # Maximum number of packets to process per frame
 UDP_BUFFER_SIZE = 4096  # Size of UDP receive buffer
+RECV_BATCH_SIZE = 64  # Datagrams pulled per batched receive (recvmmsg) call
+SOCKET_RCVBUF = 2_000_000  # Requested SO_RCVBUF so bursts of state packets are not dropped
+SOCKET_SNDBUF = 1 << 18  # Requested SO_SNDBUF
+SOCKET_TOS = 0x10  # IP_TOS value (IPTOS_LOWDELAY)
+SOCKET_PRIORITY = 6  # SO_PRIORITY on Linux (highest value allowed without CAP_NET_ADMIN)
 LOBBY_CLEANUP_TIMEOUT = 60  # Seconds after game completion before cleaning up lobby
 LOBBY_STATUS_CHECK_INTERVAL = 1.0  # How often to check lobby status (seconds)
 WAITING_PLAYER_CHECK_INTERVAL = 5.0  # How often to check for inactive waiting players (seconds)
@@ -19,6 +24,7 @@ DB_FILENAME = "server.db"
 DB_BUSY_TIMEOUT = 5000  # Milliseconds to wait if database is locked
 DB_MAX_RETRIES = 5      # Maximum number of retries for locked database
 DB_RETRY_DELAY = 0.1    # Initial delay between retries (exponential backoff applied)
+DB_AUTH_CACHE_TTL = 30.0  # Seconds a successful credential check is reused for login retries
 
 # Game physics configuration
 GAME_WIDTH = 640
@@ -35,9 +41,18 @@ COUNTDOWN_DURATION = 0.0  # seconds for countdown before ball starts moving
 
 # Client configuration
 CLIENT_TARGET_FPS = 60  # target frames per second for client
+CLIENT_SIM_RATE = 120  # fixed input/prediction steps per second, independent of frame rate
+CLIENT_SIM_MAX_STEPS = 8  # most simulation steps run for one frame (caps catch-up after a stall)
+CLIENT_WAITING_FPS = 10  # frames per second while waiting for an opponent
+CLIENT_AUTH_FPS = 30  # frames per second while authenticating
+FRAME_SPIN_MARGIN = 0.001  # seconds before a frame deadline to stop sleeping and spin
 AUTH_RETRY_INTERVAL = 2.0  # seconds between authentication retries
 HELLO_RETRY_INTERVAL = 1.0  # seconds between HELLO message retries
 HEARTBEAT_INTERVAL = 2.0  # seconds between heartbeat messages
+INPUT_SEND_INTERVAL = 1 / 30  # minimum seconds between INPUT packets (latest paddle_y wins)
+INPUT_RESEND_INTERVAL = 0.2  # re-send the paddle position if INPUTs stay unacknowledged this long
+BALL_EXTRAPOLATION_LIMIT = 0.1  # max seconds the client dead-reckons the ball past the last STATE
+INTERP_DELAY = 0.1  # seconds the client renders the remote paddle and ball behind the newest STATE
 CLIENT_SERVER_TIMEOUT = 8.0  # seconds before considering server unresponsive
 CLIENT_SERVER_WARNING = 5.0  # seconds of unresponsiveness to trigger warning
 MESSAGE_DISPLAY_TIME = 1.0  # seconds to display status messages
@@ -46,4 +61,5 @@ MESSAGE_DISPLAY_TIME = 1.0  # seconds to display status messages
 UI_DEFAULT_FONT_SIZE = 36
 UI_LARGE_FONT_SIZE = 48
 UI_GAME_OVER_DISPLAY_TIME = 2.0  # seconds to display game over message
-UI_PADDLE_SPEED = 5  # pixels per frame 
\ No newline at end of file
+UI_PADDLE_SPEED = 5  # pixels per frame
+UI_VSYNC = False  # VSync blocks each present on the refresh; off = lower input latency, possible tearing 
\ No newline at end of file
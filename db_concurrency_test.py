@@ -13,6 +13,8 @@ from pathlib import Path
 import config
 from server import ServerDB
 
+RECORD_BATCH_SIZE = 10  # game results committed per transaction
+
 def worker_process(worker_id, test_users, iterations):
     """Simulate a game lobby process updating player stats."""
     print(f"Worker {worker_id} starting")
@@ -23,13 +25,10 @@ def worker_process(worker_id, test_users, iterations):
     
     # Create test users if they don't exist
     for username in test_users:
-        try:
-            db.add_user(username, "test_password_hash")
-        except ValueError:
-            # User already exists, ignore
-            pass
+        db.ensure_user(username, "test_password_hash")
     
-    # Simulate game results
+    # Simulate game results, committing them in batches
+    pending = []
     for i in range(iterations):
         # Random sleep to simulate varying workloads
         time.sleep(random.uniform(0.01, 0.05))
@@ -37,11 +36,14 @@ def worker_process(worker_id, test_users, iterations):
         # Pick a random user and record a win or loss
         username = random.choice(test_users)
         win = random.choice([True, False])
-        try:
-            db.record_game(username, win)
-            print(f"Worker {worker_id}: Recorded {'win' if win else 'loss'} for {username}")
-        except Exception as e:
-            print(f"Worker {worker_id}: Error recording game: {e}")
+        pending.append((username, win))
+        if len(pending) >= RECORD_BATCH_SIZE or i == iterations - 1:
+            try:
+                db.record_games(pending)
+                print(f"Worker {worker_id}: Recorded {len(pending)} results")
+            except Exception as e:
+                print(f"Worker {worker_id}: Error recording games: {e}")
+            pending = []
     
     # Get final stats
     for username in test_users:
@@ -19,13 +19,15 @@ def main():
     cli = subparsers.add_parser("client", help="Run client")
     cli.add_argument("host", type=str, help="Server IP or hostname")
     cli.add_argument("--port", type=int, default=config.SERVER_PORT, help="Server UDP port")
+    cli.add_argument("--vsync", action="store_true", default=config.UI_VSYNC,
+                     help="Sync presents to the display refresh (no tearing, more input latency)")
 
     args = parser.parse_args()
 
     if args.role == "server":
         run_server_main(port=args.port)
     elif args.role == "client":
-        run_client_main(args.host, port=args.port)
+        run_client_main(args.host, port=args.port, vsync=args.vsync)
     else:
         parser.print_help()
         sys.exit(1)
@@ -0,0 +1,199 @@
+"""Batched UDP socket helpers.
+
+On Linux, recvmmsg(2) pulls many queued datagrams across the kernel boundary
+in a single syscall and sendmmsg(2) pushes many out in one. Elsewhere (or if
+libc cannot be loaded) we fall back to plain recvfrom_into / sendto loops.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import errno
+import os
+import socket
+import sys
+from typing import List, Tuple
+
+import config
+
+MSG_DONTWAIT = 0x40
+
+
+class _IoVec(ctypes.Structure):
+    _fields_ = [
+        ("iov_base", ctypes.c_void_p),
+        ("iov_len", ctypes.c_size_t),
+    ]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IoVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_hdr", _MsgHdr),
+        ("msg_len", ctypes.c_uint),
+    ]
+
+
+class _SockAddrIn(ctypes.Structure):
+    _fields_ = [
+        ("sin_family", ctypes.c_ushort),
+        ("sin_port", ctypes.c_uint16),  # network byte order
+        ("sin_addr", ctypes.c_uint8 * 4),
+        ("sin_zero", ctypes.c_uint8 * 8),
+    ]
+
+
+def _load_libc_fn(name: str, argtypes: list):
+    """Return the named libc function, or None if unavailable on this platform."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        fn = getattr(ctypes.CDLL(None, use_errno=True), name)
+    except (OSError, AttributeError):
+        return None
+    fn.argtypes = argtypes
+    fn.restype = ctypes.c_int
+    return fn
+
+
+_recvmmsg = _load_libc_fn(
+    "recvmmsg", [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int, ctypes.c_void_p])
+_sendmmsg = _load_libc_fn(
+    "sendmmsg", [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int])
+
+
+class RecvBatch:
+    """Receive every queued datagram on a non-blocking AF_INET UDP socket.
+
+    All buffers are allocated once; the memoryviews returned by recv() are only
+    valid until the next call.
+    """
+
+    def __init__(self, sock: socket.socket, size: int = config.RECV_BATCH_SIZE,
+                 bufsize: int = config.UDP_BUFFER_SIZE):
+        self.sock = sock
+        self.size = size
+        self.bufsize = bufsize
+        self._data = bytearray(size * bufsize)
+        mv = memoryview(self._data)
+        self._views = [mv[i * bufsize:(i + 1) * bufsize] for i in range(size)]
+
+        self._use_mmsg = _recvmmsg is not None
+        self._last_count = size  # headers whose msg_namelen must be reset
+        if self._use_mmsg:
+            self._c_data = (ctypes.c_char * len(self._data)).from_buffer(self._data)
+            base = ctypes.addressof(self._c_data)
+            self._iovs = (_IoVec * size)()
+            self._names = (_SockAddrIn * size)()
+            self._msgs = (_MMsgHdr * size)()
+            for i in range(size):
+                self._iovs[i].iov_base = base + i * bufsize
+                self._iovs[i].iov_len = bufsize
+                hdr = self._msgs[i].msg_hdr
+                hdr.msg_name = ctypes.addressof(self._names[i])
+                hdr.msg_iov = ctypes.pointer(self._iovs[i])
+                hdr.msg_iovlen = 1
+
+    def recv(self) -> List[Tuple[memoryview, Tuple[str, int]]]:
+        """Return ``(payload, addr)`` pairs for all datagrams ready right now."""
+        if self._use_mmsg:
+            return self._recv_mmsg()
+        return self._recv_loop()
+
+    def _recv_mmsg(self) -> List[Tuple[memoryview, Tuple[str, int]]]:
+        namelen = ctypes.sizeof(_SockAddrIn)
+        for i in range(self._last_count):
+            self._msgs[i].msg_hdr.msg_namelen = namelen
+
+        n = _recvmmsg(self.sock.fileno(), self._msgs, self.size, MSG_DONTWAIT, None)
+        if n < 0:
+            err = ctypes.get_errno()
+            self._last_count = 0
+            if err in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                return []
+            raise OSError(err, os.strerror(err))
+
+        self._last_count = n
+        out = []
+        for i in range(n):
+            name = self._names[i]
+            addr = (socket.inet_ntoa(bytes(name.sin_addr)), socket.ntohs(name.sin_port))
+            out.append((self._views[i][:self._msgs[i].msg_len], addr))
+        return out
+
+    def _recv_loop(self) -> List[Tuple[memoryview, Tuple[str, int]]]:
+        out = []
+        for view in self._views:
+            try:
+                n, addr = self.sock.recvfrom_into(view)
+            except (BlockingIOError, InterruptedError):
+                break
+            out.append((view[:n], addr))
+        return out
+
+
+class SendBatch:
+    """Send several datagrams to one destination in as few syscalls as possible.
+
+    The mmsghdr/iovec arrays are allocated once; the destination sockaddr_in is
+    rebuilt only when the address changes. ``addr`` must be a numeric IPv4 address.
+    """
+
+    def __init__(self, sock: socket.socket, size: int = config.RECV_BATCH_SIZE):
+        self.sock = sock
+        self.size = size
+        self._addr: Tuple[str, int] | None = None
+
+        self._use_mmsg = _sendmmsg is not None
+        if self._use_mmsg:
+            self._name = _SockAddrIn()
+            self._iovs = (_IoVec * size)()
+            self._msgs = (_MMsgHdr * size)()
+            for i in range(size):
+                hdr = self._msgs[i].msg_hdr
+                hdr.msg_name = ctypes.addressof(self._name)
+                hdr.msg_namelen = ctypes.sizeof(_SockAddrIn)
+                hdr.msg_iov = ctypes.pointer(self._iovs[i])
+                hdr.msg_iovlen = 1
+
+    def send(self, payloads: List[bytes], addr: Tuple[str, int]) -> None:
+        """Send every payload to ``addr``; raises OSError like sendto()."""
+        if not self._use_mmsg:
+            for payload in payloads:
+                self.sock.sendto(payload, addr)
+            return
+        if addr != self._addr:
+            self._name.sin_family = socket.AF_INET
+            self._name.sin_port = socket.htons(addr[1])
+            self._name.sin_addr[:] = socket.inet_aton(addr[0])
+            self._addr = addr
+        for start in range(0, len(payloads), self.size):
+            self._send_mmsg(payloads[start:start + self.size])
+
+    def _send_mmsg(self, chunk: List[bytes]) -> None:
+        # c_char_p points at each bytes object's own buffer; `chunk` keeps them alive
+        for i, payload in enumerate(chunk):
+            self._iovs[i].iov_base = ctypes.cast(ctypes.c_char_p(payload), ctypes.c_void_p)
+            self._iovs[i].iov_len = len(payload)
+
+        sent = 0
+        fd = self.sock.fileno()
+        while sent < len(chunk):
+            n = _sendmmsg(fd, ctypes.byref(self._msgs[sent]), len(chunk) - sent, 0)
+            if n < 0:
+                err = ctypes.get_errno()
+                if err == errno.EINTR:
+                    continue
+                raise OSError(err, os.strerror(err))
+            sent += n
@@ -6,13 +6,48 @@ Both client and server import this file so they always agree on
 packet format and version.
 """
 
+import inspect
 import json
+import struct
 import time
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import IntEnum
 from typing import Tuple, Type, Dict, Any, Union
 
-PROTOCOL_VERSION: int = 1  # Bump this whenever the wire format changes
+PROTOCOL_VERSION: int = 5  # Bump this whenever the wire format changes
+
+try:
+    import orjson  # optional: much faster JSON for the string-carrying messages
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _json_dumps = orjson.dumps  # compact UTF-8 bytes, same wire form as below
+    _json_loads = orjson.loads
+else:
+    # Built once at import and reused for every packet. Compact separators keep
+    # datagrams small and skip json.dumps' per-call encoder construction.
+    _ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+    _DECODER = json.JSONDecoder()
+
+    def _json_dumps(obj: Dict[str, Any]) -> bytes:
+        return _ENCODER.encode(obj).encode("utf-8")
+
+    def _json_loads(raw: bytes) -> Any:
+        return _DECODER.decode(str(raw, "utf-8"))  # str() also takes a memoryview
+
+# Fixed-layout messages use binary structs instead of JSON; only messages made
+# of free-form strings (login, hello, denied, game over) stay JSON. Every binary
+# packet starts with (version, type) bytes; JSON packets always start with "{".
+_HEADER = struct.Struct("!BB")
+_INPUT_S = struct.Struct("!BBIf")  # version, type, seq, paddle_y
+_WELCOME_S = struct.Struct("!BBb")  # version, type, player_id
+_PING_S = struct.Struct("!BBd")  # version, type, ts (PING and PONG)
+# version, type, tick, ball_x, ball_y, paddle0_y, paddle1_y, score0, score1,
+# ball_vx, ball_vy, ack0, ack1; followed by the two usernames (see _pack_name)
+_STATE_S = struct.Struct("!BBIffffHHffii")
+_NAME_LEN = struct.Struct("!H")
+_NO_NAME = 0xFFFF  # length marker for a missing username
 
 
 class MessageType(IntEnum):
@@ -33,17 +68,27 @@ class MessageType(IntEnum):
 class BaseMessage:
     """Parent class that provides encode() helper common to all messages."""
 
+    # Hot-path messages declare __slots__ so each decoded packet skips the
+    # per-instance __dict__. Listed by hand: dataclass(slots=True) rebuilds the
+    # class, which breaks the zero-argument super() calls in __init__.
+    __slots__ = ("type",)
+
     type: MessageType
 
     def encode(self) -> bytes:
-        payload = asdict(self)
+        # Every field is a flat primitive, so read the slots directly instead of
+        # going through asdict()'s recursive deep copy.
+        payload = {"type": int(self.type)}
+        for name in type(self).__slots__:
+            payload[name] = getattr(self, name)
         payload["version"] = PROTOCOL_VERSION
-        payload["type"] = int(self.type)
-        return json.dumps(payload).encode("utf-8")
+        return _json_dumps(payload)
 
 
 @dataclass
 class Hello(BaseMessage):
+    __slots__ = ("username",)
+
     username: str
 
     def __init__(self, username: str):
@@ -52,6 +97,8 @@ class Hello(BaseMessage):
 
 @dataclass
 class Pulse(BaseMessage):
+    __slots__ = ("username",)
+
     username: str
 
     def __init__(self, username: str):
@@ -61,15 +108,26 @@ class Pulse(BaseMessage):
 
 @dataclass
 class Welcome(BaseMessage):
+    __slots__ = ("player_id",)
+
     player_id: int  # 0 (left) or 1 (right)
 
     def __init__(self, player_id: int):
         super().__init__(MessageType.WELCOME)
         self.player_id = player_id
 
+    def encode(self) -> bytes:
+        return _WELCOME_S.pack(PROTOCOL_VERSION, MessageType.WELCOME, self.player_id)
+
+
+def _decode_welcome(raw: bytes) -> Welcome:
+    return Welcome(_WELCOME_S.unpack(raw)[2])
+
 
 @dataclass
 class Input(BaseMessage):
+    __slots__ = ("seq", "paddle_y")
+
     seq: int
     paddle_y: float
 
@@ -78,9 +136,25 @@ class Input(BaseMessage):
         self.seq = seq
         self.paddle_y = paddle_y
 
+    def encode(self) -> bytes:
+        return encode_input(self.seq, self.paddle_y)
+
+
+def encode_input(seq: int, paddle_y: float) -> bytes:
+    """Pack an INPUT packet directly, without building an Input object."""
+    return _INPUT_S.pack(PROTOCOL_VERSION, MessageType.INPUT, seq, paddle_y)
+
+
+def _decode_input(raw: bytes) -> Input:
+    _version, _type, seq, paddle_y = _INPUT_S.unpack(raw)
+    return Input(seq, paddle_y)
+
 
 @dataclass
 class State(BaseMessage):
+    __slots__ = ("tick", "ball_x", "ball_y", "paddle0_y", "paddle1_y", "score0", "score1",
+                 "player0_username", "player1_username", "ball_vx", "ball_vy", "ack0", "ack1")
+
     tick: int
     ball_x: float
     ball_y: float
@@ -90,9 +164,14 @@ class State(BaseMessage):
     score1: int
     player0_username: str | None
     player1_username: str | None
+    ball_vx: float  # px/s, lets the client extrapolate the ball between packets
+    ball_vy: float
+    ack0: int  # last INPUT seq the server applied for player 0 (-1 = none)
+    ack1: int
 
     def __init__(self, tick: int, ball_x: float, ball_y: float, paddle0_y: float, paddle1_y: float, 
-                 score0: int, score1: int, player0_username: str | None = None, player1_username: str | None = None):
+                 score0: int, score1: int, player0_username: str | None = None, player1_username: str | None = None,
+                 ball_vx: float = 0.0, ball_vy: float = 0.0, ack0: int = -1, ack1: int = -1):
         super().__init__(MessageType.STATE)
         self.tick = tick
         self.ball_x = ball_x
@@ -103,28 +182,131 @@ class State(BaseMessage):
         self.score1 = score1
         self.player0_username = player0_username
         self.player1_username = player1_username
+        self.ball_vx = ball_vx
+        self.ball_vy = ball_vy
+        self.ack0 = ack0
+        self.ack1 = ack1
+
+    def encode(self) -> bytes:
+        return b"".join((
+            _STATE_S.pack(PROTOCOL_VERSION, MessageType.STATE, self.tick,
+                          self.ball_x, self.ball_y, self.paddle0_y, self.paddle1_y,
+                          self.score0, self.score1, self.ball_vx, self.ball_vy,
+                          self.ack0, self.ack1),
+            _pack_name(self.player0_username),
+            _pack_name(self.player1_username),
+        ))
+
+
+def _pack_name(name: str | None) -> bytes:
+    if name is None:
+        return _NAME_LEN.pack(_NO_NAME)
+    data = name.encode("utf-8")
+    return _NAME_LEN.pack(len(data)) + data
+
+
+def _unpack_name(raw: bytes, offset: int) -> Tuple[str | None, int]:
+    (length,) = _NAME_LEN.unpack_from(raw, offset)
+    offset += _NAME_LEN.size
+    if length == _NO_NAME:
+        return None, offset
+    end = offset + length
+    if end > len(raw):
+        raise ValueError("Truncated username")
+    return bytes(raw[offset:end]).decode("utf-8"), end
+
+
+def _decode_state(raw: bytes) -> State:
+    (_version, _type, tick, ball_x, ball_y, paddle0_y, paddle1_y, score0, score1,
+     ball_vx, ball_vy, ack0, ack1) = _STATE_S.unpack_from(raw)
+    name0, offset = _unpack_name(raw, _STATE_S.size)
+    name1, _ = _unpack_name(raw, offset)
+    # Fill the slots directly: State() would also run BaseMessage.__init__ via super()
+    msg = State.__new__(State)
+    msg.type = MessageType.STATE
+    msg.tick = tick
+    msg.ball_x = ball_x
+    msg.ball_y = ball_y
+    msg.paddle0_y = paddle0_y
+    msg.paddle1_y = paddle1_y
+    msg.score0 = score0
+    msg.score1 = score1
+    msg.player0_username = name0
+    msg.player1_username = name1
+    msg.ball_vx = ball_vx
+    msg.ball_vy = ball_vy
+    msg.ack0 = ack0
+    msg.ack1 = ack1
+    return msg
+
+
+class StatePacker:
+    """Encode the server's per-tick STATE into one reused buffer.
+
+    The usernames only change when a player joins or leaves, so their encoded
+    tail is kept and the fixed header is packed in place each tick. The result
+    matches State.encode() byte for byte; it is only valid until the next call.
+    """
+
+    __slots__ = ("_buf", "_names")
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._names: Tuple[str | None, str | None] | None = None
+
+    def pack(self, tick: int, ball_x: float, ball_y: float, paddle0_y: float, paddle1_y: float,
+             score0: int, score1: int, player0_username: str | None, player1_username: str | None,
+             ball_vx: float, ball_vy: float, ack0: int, ack1: int) -> bytearray:
+        names = (player0_username, player1_username)
+        if names != self._names:
+            self._buf = bytearray(_STATE_S.size) + _pack_name(player0_username) + _pack_name(player1_username)
+            self._names = names
+        _STATE_S.pack_into(self._buf, 0, PROTOCOL_VERSION, MessageType.STATE, tick,
+                           ball_x, ball_y, paddle0_y, paddle1_y, score0, score1,
+                           ball_vx, ball_vy, ack0, ack1)
+        return self._buf
 
 
 @dataclass
 class Ping(BaseMessage):
+    __slots__ = ("ts",)
+
     ts: float
 
     def __init__(self, ts: float | None = None):
         super().__init__(MessageType.PING)
         self.ts = ts if ts is not None else time.time()
 
+    def encode(self) -> bytes:
+        return _PING_S.pack(PROTOCOL_VERSION, MessageType.PING, self.ts)
+
 
 @dataclass
 class Pong(BaseMessage):
+    __slots__ = ("ts",)
+
     ts: float
 
     def __init__(self, ts: float):
         super().__init__(MessageType.PONG)
         self.ts = ts
 
+    def encode(self) -> bytes:
+        return _PING_S.pack(PROTOCOL_VERSION, MessageType.PONG, self.ts)
+
+
+def _decode_ping(raw: bytes) -> Ping:
+    return Ping(_PING_S.unpack(raw)[2])
+
+
+def _decode_pong(raw: bytes) -> Pong:
+    return Pong(_PING_S.unpack(raw)[2])
+
 
 @dataclass
 class Denied(BaseMessage):
+    __slots__ = ("reason",)
+
     reason: str
 
     def __init__(self, reason: str):
@@ -134,15 +316,19 @@ class Denied(BaseMessage):
 
 @dataclass
 class GameOver(BaseMessage):
+    __slots__ = ("reason", "winner", "winner_username", "score", "player_username",
+                 "opponent_username", "player_games", "player_wins", "player_losses")
+
+    # Defaults live in __init__ only: a class-level default would clash with the slot
     reason: str
-    winner: int = -1  # -1 = no winner (disconnect), 0 = left player, 1 = right player
-    winner_username: str = ""
-    score: str = ""
-    player_username: str = ""
-    opponent_username: str = ""
-    player_games: int = 0
-    player_wins: int = 0
-    player_losses: int = 0
+    winner: int  # -1 = no winner (disconnect), 0 = left player, 1 = right player
+    winner_username: str
+    score: str
+    player_username: str
+    opponent_username: str
+    player_games: int
+    player_wins: int
+    player_losses: int
 
     def __init__(self, reason: str, winner: int = -1, winner_username: str = "", 
                  score: str = "", player_username: str = "", opponent_username: str = "",
@@ -161,6 +347,8 @@ class GameOver(BaseMessage):
 
 @dataclass
 class Login(BaseMessage):
+    __slots__ = ("username", "password_hash")
+
     username: str
     password_hash: str
 
@@ -172,6 +360,8 @@ class Login(BaseMessage):
 
 @dataclass
 class LoginResult(BaseMessage):
+    __slots__ = ("success", "message")
+
     success: bool
     message: str
 
@@ -181,39 +371,116 @@ class LoginResult(BaseMessage):
         self.message = message
 
 
-# Mapping from MessageType to its concrete dataclass constructor
-_TYPE_TO_CLS: Dict[MessageType, Type[BaseMessage]] = {
-    MessageType.HELLO: Hello,  # type: ignore[arg-type]
-    MessageType.PULSE: Pulse,  # type: ignore[arg-type]
-    MessageType.WELCOME: Welcome,  # type: ignore[arg-type]
-    MessageType.INPUT: Input,  # type: ignore[arg-type]
-    MessageType.STATE: State,  # type: ignore[arg-type]
-    MessageType.PING: Ping,  # type: ignore[arg-type]
-    MessageType.PONG: Pong,  # type: ignore[arg-type]
-    MessageType.DENIED: Denied,  # type: ignore[arg-type]
-    MessageType.GAME_OVER: GameOver,  # type: ignore[arg-type]
-    MessageType.LOGIN: Login,  # type: ignore[arg-type]
-    MessageType.LOGIN_RESULT: LoginResult,  # type: ignore[arg-type]
-}
+# Message types are contiguous from 0, so per-type tables are tuples indexed by
+# the raw type number: no IntEnum construction or hashing per packet.
+_MESSAGE_TYPES: Tuple[MessageType, ...] = tuple(MessageType)
+
+# Concrete dataclass constructor for each type, in MessageType order
+_CLS_BY_TYPE: Tuple[Type[BaseMessage], ...] = (  # type: ignore[assignment]
+    Hello,        # HELLO = 0
+    Pulse,        # PULSE = 1
+    Welcome,      # WELCOME = 2
+    Input,        # INPUT = 3
+    State,        # STATE = 4
+    Ping,         # PING = 5
+    Pong,         # PONG = 6
+    Denied,       # DENIED = 7
+    GameOver,     # GAME_OVER = 8
+    Login,        # LOGIN = 9
+    LoginResult,  # LOGIN_RESULT = 10
+)
+assert len(_CLS_BY_TYPE) == len(_MESSAGE_TYPES) and all(
+    mtype == i for i, mtype in enumerate(_MESSAGE_TYPES)), "MessageType must be contiguous from 0"
+
+_REQUIRED = object()  # marks constructor fields without a default
+
+
+def _init_fields(cls: Type[BaseMessage]) -> Tuple[Tuple[str, Any], ...]:
+    """(name, default) for each __init__ parameter, read once at import."""
+    params = list(inspect.signature(cls.__init__).parameters.values())[1:]  # drop self
+    return tuple((p.name, _REQUIRED if p.default is p.empty else p.default) for p in params)
+
+
+# Constructor fields per type, used by decode() to fill instances directly
+_INIT_FIELDS: Tuple[Tuple[Tuple[str, Any], ...], ...] = tuple(
+    _init_fields(cls) for cls in _CLS_BY_TYPE)
+
+# Decoders for the messages sent in binary form, indexed by the type byte
+_BINARY_DECODERS = tuple({
+    MessageType.WELCOME: _decode_welcome,
+    MessageType.INPUT: _decode_input,
+    MessageType.STATE: _decode_state,
+    MessageType.PING: _decode_ping,
+    MessageType.PONG: _decode_pong,
+}.get(mtype) for mtype in MessageType)
+
 
 def decode(raw: bytes) -> BaseMessage:
-    """Convert raw UDP payload into a concrete message instance."""
+    """Convert raw UDP payload into a concrete message instance.
+
+    ``raw`` may be any bytes-like object, e.g. a memoryview into a receive buffer.
+    """
+    if raw[:1] != b"{":
+        return _decode_binary(raw)
     try:
-        obj: Dict[str, Any] = json.loads(raw.decode("utf-8"))
+        obj: Dict[str, Any] = _json_loads(raw)
     except Exception as exc:
         raise ValueError(f"Invalid JSON packet: {exc}") from exc
 
     if obj.get("version") != PROTOCOL_VERSION:
         raise ValueError("Protocol version mismatch")
 
+    t = obj.get("type")
+    if type(t) is not int or not 0 <= t < len(_MESSAGE_TYPES):
+        raise ValueError("Unknown or missing message type")
+    mtype = _MESSAGE_TYPES[t]
+
+    # Build the instance without running __init__ (and its super() call):
+    # allocate it and set each constructor field, applying the same defaults.
+    cls = _CLS_BY_TYPE[t]
+    msg = cls.__new__(cls)
+    msg.type = mtype
+    for name, default in _INIT_FIELDS[t]:
+        value = obj.get(name, default)
+        if value is _REQUIRED:
+            raise ValueError(f"Missing field {name!r} in {mtype.name} packet")
+        setattr(msg, name, value)
+    return msg
+
+
+def peek_type(raw: bytes) -> int | None:
+    """Return the message type of a binary packet without decoding it.
+
+    JSON packets (and anything too short to carry a header) return None.
+    """
+    if len(raw) < _HEADER.size or raw[0] == 0x7B:  # b"{"
+        return None
+    return raw[1]
+
+
+def _decode_binary(raw: bytes) -> BaseMessage:
+    if len(raw) < _HEADER.size:
+        raise ValueError("Truncated packet")
+    version, mtype = _HEADER.unpack_from(raw)
+    if version != PROTOCOL_VERSION:
+        raise ValueError("Protocol version mismatch")
+    decoder = _BINARY_DECODERS[mtype] if mtype < len(_BINARY_DECODERS) else None
+    if decoder is None:
+        raise ValueError("Unknown or missing message type")
     try:
-        mtype = MessageType(obj["type"])
-    except (KeyError, ValueError) as exc:
-        raise ValueError("Unknown or missing message type") from exc
+        return decoder(raw)
+    except (struct.error, UnicodeDecodeError) as exc:
+        raise ValueError(f"Malformed {MessageType(mtype).name} packet: {exc}") from exc
 
-    cls = _TYPE_TO_CLS[mtype]
 
-    # Pop fields that are not dataclass members
-    payload = {k: v for k, v in obj.items() if k not in {"type", "version"}}
+def decode_state(raw: bytes) -> State:
+    """Decode a packet already known to be a binary STATE (see peek_type()).
 
-    return cls(**payload)  # type: ignore[arg-type] 
\ No newline at end of file
+    Skips decode()'s JSON check and type dispatch on the client's hottest path.
+    """
+    if raw[0] != PROTOCOL_VERSION:
+        raise ValueError("Protocol version mismatch")
+    try:
+        return _decode_state(raw)
+    except (struct.error, UnicodeDecodeError) as exc:
+        raise ValueError(f"Malformed STATE packet: {exc}") from exc
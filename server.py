@@ -4,10 +4,13 @@ from __future__ import annotations
 Run with: python main.py server [port]
 """
 
+import functools
 import hashlib
+import hmac
 import os
 import socket
 import sqlite3
+import threading
 import time
 import logging
 import multiprocessing
@@ -15,10 +18,11 @@ import random
 from dataclasses import dataclass
 from enum import Enum, IntEnum
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterable, List, Optional, Tuple, Any
 import json
 
 import config
+from net_batch import RecvBatch
 
 from protocol import (
     Denied,
@@ -29,7 +33,7 @@ from protocol import (
     Login,
     LoginResult,
     MessageType,
-    State,
+    StatePacker,
     Welcome,
     decode,
 )
@@ -50,6 +54,18 @@ CREATE TABLE IF NOT EXISTS users (
     losses INTEGER DEFAULT 0
 );
 """
+# Hot queries, kept as constants so every call hits the connection's statement cache
+_SQL_INSERT_USER = "INSERT OR IGNORE INTO users (username, password_hash) VALUES (?, ?)"
+_SQL_VERIFY = "SELECT password_hash FROM users WHERE username = ?"
+_SQL_RECORD = "UPDATE users SET games = games + 1, wins = wins + ?, losses = losses + ? WHERE username = ?"
+_SQL_STATS = "SELECT games, wins, losses FROM users WHERE username = ?"
+
+
+@functools.lru_cache(maxsize=1024)
+def _pulse_reply(username: str) -> bytes:
+    """Encoded PULSE echo; a client heartbeats with the same username every time."""
+    return Pulse(username=username).encode()
+
 
 # Setup detailed logging
 logging.basicConfig(
@@ -82,6 +98,13 @@ class ServerDB:
     
     def __init__(self, db_path: str | os.PathLike | None = None):
         self.db_path = Path(db_path) if db_path else DB_FILE
+        # (username, password_hash) -> time of the last successful verify_user();
+        # clients retry LOGIN with the same credentials, so skip the query for those
+        self._verified: Dict[Tuple[str, str], float] = {}
+        # One long-lived connection per process (see _get_connection)
+        self._conn: sqlite3.Connection | None = None
+        self._conn_pid = -1
+        self._lock = threading.RLock()
         
         # Make sure the parent directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -93,15 +116,34 @@ class ServerDB:
         logger.info(f"Initialized user database at {self.db_path}")
 
     def _get_connection(self):
-        """Get a new database connection. Always call this instead of reusing connections."""
+        """Return this process's database connection, opening it on first use.
+
+        Reusing the connection avoids reopening the database, WAL and shm files on
+        every query. Each lobby process gets its own connection; one inherited
+        through fork() is never used, a fresh one is opened instead.
+        """
+        if self._conn is not None and self._conn_pid == os.getpid():
+            return self._conn
         # Enable WAL mode for better concurrency
-        conn = sqlite3.connect(self.db_path, timeout=20.0)
+        conn = sqlite3.connect(self.db_path, timeout=20.0, check_same_thread=False)
         conn.execute("PRAGMA journal_mode=WAL")
+        # WAL only needs to fsync at checkpoints; a crash can lose the last
+        # commits but never corrupts the database
+        conn.execute("PRAGMA synchronous=NORMAL")
         # Set a busy timeout to wait for locks to be released
         conn.execute(f"PRAGMA busy_timeout = {config.DB_BUSY_TIMEOUT}")
         conn.row_factory = sqlite3.Row
+        self._conn = conn
+        self._conn_pid = os.getpid()
         return conn
 
+    def close(self) -> None:
+        """Close the database connection (reopened on the next query)."""
+        with self._lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
     def _execute_with_retry(self, operation, params=(), max_retries=None, retry_delay=None):
         """Execute a database operation with retry logic for handling database locks."""
         max_retries = config.DB_MAX_RETRIES if max_retries is None else max_retries
@@ -110,7 +152,8 @@ class ServerDB:
         retries = 0
         while True:
             try:
-                with self._get_connection() as conn:
+                # The connection is shared, so one operation runs at a time
+                with self._lock, self._get_connection() as conn:
                     result = operation(conn, params)
                     return result
             except sqlite3.OperationalError as e:
@@ -125,62 +168,73 @@ class ServerDB:
     # --------------------------------------------------- #
     def add_user(self, username: str, password_hash: str) -> None:
         """Add a new user to the database."""
-        def _operation(conn, params):
-            username, password_hash = params
-            try:
-                conn.execute(
-                    "INSERT INTO users (username, password_hash) VALUES (?, ?)",
-                    (username, password_hash),
-                )
-                conn.commit()
-            except sqlite3.IntegrityError:
-                raise ValueError("Username already exists")
-            
-        try:
-            self._execute_with_retry(_operation, (username, password_hash))
-        except sqlite3.IntegrityError:
+        if not self.ensure_user(username, password_hash):
             raise ValueError("Username already exists")
 
+    def ensure_user(self, username: str, password_hash: str) -> bool:
+        """Add the user unless the name is taken. Returns True if a row was inserted."""
+        def _operation(conn, params):
+            # OR IGNORE reports a duplicate as rowcount 0 instead of raising IntegrityError
+            cur = conn.execute(_SQL_INSERT_USER, params)
+            conn.commit()
+            return cur.rowcount == 1
+
+        return self._execute_with_retry(_operation, (username, password_hash))
+
     def verify_user(self, username: str, password_hash: str) -> bool:
         """Verify user credentials."""
+        key = (username, password_hash)
+        now = time.monotonic()
+        with self._lock:  # the cache is shared like the connection
+            verified_at = self._verified.get(key)
+        if verified_at is not None and now - verified_at < config.DB_AUTH_CACHE_TTL:
+            return True
+
         def _operation(conn, params):
             username, password_hash = params
-            cur = conn.execute(
-                "SELECT password_hash FROM users WHERE username = ?", (username,)
-            )
+            cur = conn.execute(_SQL_VERIFY, (username,))
             row = cur.fetchone()
-            if not row:
+            if not row or not isinstance(password_hash, str):
                 return False
-            return row[0] == password_hash
+            # Constant-time compare; bytes because compare_digest rejects non-ASCII str
+            return hmac.compare_digest(row[0].encode("utf-8"), password_hash.encode("utf-8"))
             
-        return self._execute_with_retry(_operation, (username, password_hash))
+        ok = self._execute_with_retry(_operation, (username, password_hash))
+        if ok:
+            with self._lock:
+                if len(self._verified) >= 1024:
+                    self._verified.clear()
+                self._verified[key] = now
+        return ok
 
     # --------------------------------------------------- #
     def record_game(self, username: str, win: bool) -> None:
         """Record game outcome for a user with proper transaction handling."""
+        self.record_games([(username, win)])
+
+    def record_games(self, batch: Iterable[Tuple[str, bool]]) -> None:
+        """Record several ``(username, win)`` outcomes in one transaction."""
+        rows = [(1 if win else 0, 0 if win else 1, username) for username, win in batch]
+        if not rows:
+            return
+
         def _operation(conn, params):
-            username, win = params
             # Use a transaction to ensure atomic update
             conn.execute("BEGIN IMMEDIATE")  # Get an immediate lock
             try:
-                conn.execute(
-                    "UPDATE users SET games = games + 1, wins = wins + ?, losses = losses + ? WHERE username = ?",
-                    (1 if win else 0, 0 if win else 1, username),
-                )
+                conn.executemany(_SQL_RECORD, params)
                 conn.commit()
             except Exception as e:
                 conn.rollback()
                 raise e
-                
-        self._execute_with_retry(_operation, (username, win))
+
+        self._execute_with_retry(_operation, rows)
 
     def get_stats(self, username: str) -> Tuple[int, int, int]:
         """Get user statistics."""
         def _operation(conn, params):
             username = params[0]
-            cur = conn.execute(
-                "SELECT games, wins, losses FROM users WHERE username = ?", (username,)
-            )
+            cur = conn.execute(_SQL_STATS, (username,))
             row = cur.fetchone()
             if row:
                 return int(row[0]), int(row[1]), int(row[2])
@@ -195,6 +249,7 @@ class PlayerSlot:
     paddle_y: float = 0.0
     last_pulse_time: float = 0.0
     username: str | None = None
+    last_seq: int = -1  # highest INPUT seq applied, echoed to the client as its ack
 
 
 class GameState:
@@ -243,7 +298,6 @@ class GameState:
         # Left paddle collision
         if self.ball_x <= self.PADDLE_W:
             if self.paddles[0] <= self.ball_y <= self.paddles[0] + self.PADDLE_H:
-                print("print", self.ball_y)
                 self.ball_x = self.PADDLE_W
                 self.ball_vx = abs(self.ball_vx)
                 self.ball_vy += self.BALL_SPEED * (random.random() - 0.5)/5
@@ -255,7 +309,6 @@ class GameState:
                 self.ball_vy += self.BALL_SPEED * (random.random() - 0.5)/5
 
         # Scoring
-        print(f"Ball position: {self.ball_x}")
         if self.ball_x < 0:
             self.scores[1] += 1
             self.reset_ball(direction=1)
@@ -276,6 +329,8 @@ class PongServer:
             self.sock.bind((host, port))
             self.sock.setblocking(False)
             logger.debug("Created non-blocking UDP socket")
+            # One recvmmsg per loop pass; the batch size keeps the per-frame packet cap
+            self._rx = RecvBatch(self.sock, size=config.MAX_PACKETS_PER_FRAME)
         except OSError as e:
             logger.error(f"Failed to bind socket on {host}:{port}: {e}")
             if pipe_conn:
@@ -286,6 +341,7 @@ class PongServer:
         self.game = GameState()
         self.game_running = False
         self.start_time: float | None = None
+        self._state_packer = StatePacker()  # reused STATE buffer for broadcast_state
         logger.debug("Game state initialized")
         
         try:
@@ -294,7 +350,8 @@ class PongServer:
             if isinstance(db_path, str):
                 db_path = Path(db_path)
             self.db = ServerDB(db_path)
-            # Mapping of authenticated clients by address
+            # Mapping of authenticated clients by address, kept current by the
+            # lobby manager's "auth_update" messages
             self.authenticated_users = {}  # addr -> username
             logger.debug("Authentication system initialized")
         except Exception as e:
@@ -312,30 +369,18 @@ class PongServer:
     def send(self, msg, addr):
         self.sock.sendto(msg.encode(), addr)
 
-    def update_authenticated_users(self):
-        # get all authenticated users from the parent process
-        if self.pipe_conn:
-            self.pipe_conn.send({"type": "get_authenticated_users"})
-            self.authenticated_users = self.pipe_conn.recv()
-
     def broadcast_state(self):
-        
-        # Get usernames from slots
-        player0_username = self.slots[0].username if self.slots[0] else None
-        player1_username = self.slots[1].username if self.slots[1] else None
-        
-        state_msg = State(
-            tick=self.game.tick,
-            ball_x=self.game.ball_x,
-            ball_y=self.game.ball_y,
-            paddle0_y=self.game.paddles[0],
-            paddle1_y=self.game.paddles[1],
-            score0=self.game.scores[0],
-            score1=self.game.scores[1],
-            player0_username=player0_username,
-            player1_username=player1_username
+        slot0, slot1 = self.slots
+        game = self.game
+        payload = self._state_packer.pack(
+            game.tick, game.ball_x, game.ball_y, game.paddles[0], game.paddles[1],
+            game.scores[0], game.scores[1],
+            slot0.username if slot0 else None,
+            slot1.username if slot1 else None,
+            game.ball_vx, game.ball_vy,
+            slot0.last_seq if slot0 else -1,
+            slot1.last_seq if slot1 else -1,
         )
-        payload = state_msg.encode()
         for slot in self.slots:
             if slot is not None:
                 self.sock.sendto(payload, slot.addr)
@@ -345,7 +390,7 @@ class PongServer:
         # self.last_pulse_time = time.perf_counter()
         try:
             msg = decode(raw)
-            logger.info(f"Received {msg.__class__.__name__} from {addr}")
+            logger.info("Received %s from %s", msg.__class__.__name__, addr)
             
             # Update last_pulse_time for ANY message from client
             slot = self._find_slot_by_addr(addr)
@@ -377,16 +422,12 @@ class PongServer:
         return None
     
     def _handle_pulse(self, msg: Pulse, addr):
-        slot = self._find_slot_by_addr(addr)
-        
         # Always echo pulse back to client even if not in slot
-        return_msg = Pulse(username=msg.username)
-        self.send(return_msg, addr)
+        self.sock.sendto(_pulse_reply(msg.username), addr)
 
     def _handle_login(self, msg: Login, addr):
         """Handle login request and respond with success/failure."""
         logger.debug(f"Processing LOGIN request for username={msg.username} from {addr}")
-        self.update_authenticated_users()
         try:
             if self.db.verify_user(msg.username, msg.password_hash):
                 # check if user is already logged in
@@ -477,26 +518,24 @@ class PongServer:
             logger.info(f"Player 1: {self.slots[1].username} from {self.slots[1].addr}")
 
     def _handle_input(self, msg: Input, addr):
-        logger.debug(f"Processing INPUT from {addr}, seq={msg.seq}, paddle_y={msg.paddle_y}")
+        logger.debug("Processing INPUT from %s, seq=%s, paddle_y=%s", addr, msg.seq, msg.paddle_y)
         slot = self._find_slot_by_addr(addr)
         if slot is None:
             logger.warning(f"Received INPUT from unknown player {addr}")
             return  # unknown player
+        if msg.seq <= slot.last_seq:
+            return  # stale or duplicate; UDP may reorder packets
+        slot.last_seq = msg.seq
         slot.paddle_y = max(0, min(self.game.H - self.game.PADDLE_H, msg.paddle_y))
-        logger.debug(f"Updated player {slot.id} paddle_y={slot.paddle_y}, last_pulse_time={slot.last_pulse_time}")
+        logger.debug("Updated player %s paddle_y=%s, last_pulse_time=%s", slot.id, slot.paddle_y, slot.last_pulse_time)
         self.game.paddles[slot.id] = slot.paddle_y
 
     def _process_network_packets(self):
         """Process all pending network packets in the UDP receive buffer."""
-        packets_processed = 0
-        while packets_processed < config.MAX_PACKETS_PER_FRAME:
-            try:
-                data, addr = self.sock.recvfrom(config.UDP_BUFFER_SIZE)
-                self.handle_packet(data, addr)
-                packets_processed += 1
-            except BlockingIOError:
-                break  # No more packets waiting
-        return packets_processed
+        batch = self._rx.recv()  # up to MAX_PACKETS_PER_FRAME datagrams in one syscall
+        for data, addr in batch:
+            self.handle_packet(data, addr)
+        return len(batch)
 
     def _check_player_timeouts(self, now):
         """Check for disconnected players."""
@@ -559,7 +598,7 @@ class PongServer:
         # Grace period before physics begins
         if self.start_time and now < self.start_time + config.COUNTDOWN_DURATION:
             # Keep sending neutral state so clients show countdown-like pause
-            logger.debug(f"In grace period, {self.start_time + config.COUNTDOWN_DURATION - now:.1f}s remaining")
+            logger.debug("In grace period, %.1fs remaining", self.start_time + config.COUNTDOWN_DURATION - now)
             self.broadcast_state()
             return next_tick
             
@@ -583,24 +622,20 @@ class PongServer:
                 
                 logger.info(f"Game over: {winner_username} wins with a score of {self.game.scores[0]}-{self.game.scores[1]}")
                 
-                # Record the game results in the database
-                if self.slots[winner] and self.slots[winner].username:
-                    # Record win for winner
-                    self.db.record_game(self.slots[winner].username, win=True)
-                    winner_stats = self.db.get_stats(self.slots[winner].username)
-                    logger.info(f"Updated stats for {self.slots[winner].username}: {winner_stats}")
-                
-                if self.slots[loser] and self.slots[loser].username:
-                    # Record loss for loser
-                    self.db.record_game(self.slots[loser].username, win=False)
-                    loser_stats = self.db.get_stats(self.slots[loser].username)
-                    logger.info(f"Updated stats for {self.slots[loser].username}: {loser_stats}")
+                # Record the win and the loss in one transaction
+                results = [(self.slots[i].username, i == winner) for i in (winner, loser)
+                           if self.slots[i] and self.slots[i].username]
+                self.db.record_games(results)
+                stats = {}
+                for username, _ in results:
+                    stats[username] = self.db.get_stats(username)
+                    logger.info(f"Updated stats for {username}: {stats[username]}")
                 
                 # Send game over message to both players with stats
                 for slot in self.slots:
                     if slot:
-                        # Get the player's stats
-                        player_stats = self.db.get_stats(slot.username) if slot.username else (0, 0, 0)
+                        # Get the player's stats (read once above)
+                        player_stats = stats.get(slot.username, (0, 0, 0))
                         # Get opponent's username
                         opponent_slot = self.slots[1] if slot.id == 0 else self.slots[0]
                         opponent_username = opponent_slot.username if opponent_slot else "Unknown"
@@ -643,8 +678,8 @@ class PongServer:
         if not self.pipe_conn:
             return
             
-        # Non-blocking check for messages
-        if self.pipe_conn.poll():
+        # Non-blocking drain of everything queued (auth updates can arrive in bursts)
+        while self.pipe_conn.poll():
             msg = self.pipe_conn.recv()
             if msg.get("type") == "shutdown":
                 logger.info(f"Received shutdown request from parent process")
@@ -655,6 +690,10 @@ class PongServer:
                         self.send(game_over, slot.addr)
                 # Exit the process
                 return False
+            elif msg.get("type") == "auth_update":
+                self.authenticated_users.update(msg["adds"])
+                for addr in msg["removes"]:
+                    self.authenticated_users.pop(addr, None)
         return True
 
     # ------------- main loop ------------- #
@@ -716,6 +755,7 @@ class LobbyManager:
         self.sock.bind((host, port))
         self.sock.setblocking(False)
         logger.debug("Created non-blocking UDP socket")
+        self._rx = RecvBatch(self.sock)
         
         self.host = host
         self.main_port = port
@@ -729,10 +769,31 @@ class LobbyManager:
         self.lobbies: Dict[int, LobbyInfo] = {}
         self.waiting_players: Dict[str, Tuple[str, Tuple[str, int]]] = {}  # username -> (username, address)
         
-        # Authentication tracking
+        # Authentication tracking. Lobbies keep a copy: change it only through
+        # _set_authenticated/_clear_authenticated so they are told.
         self.authenticated_users = {}  # addr -> username
         
         logger.info("Lobby manager initialized")
+
+    def _set_authenticated(self, addr: Tuple[str, int], username: str):
+        """Record a logged-in address and push it to every lobby."""
+        self.authenticated_users[addr] = username
+        self._push_auth_update(adds={addr: username})
+
+    def _clear_authenticated(self, addr: Tuple[str, int]):
+        """Forget a logged-in address and push the removal to every lobby."""
+        if self.authenticated_users.pop(addr, None) is not None:
+            self._push_auth_update(removes=[addr])
+
+    def _push_auth_update(self, adds=None, removes=None, lobbies=None):
+        """Send authenticated_users changes to lobbies (all of them by default)."""
+        msg = {"type": "auth_update", "adds": adds or {}, "removes": removes or []}
+        for lobby in self.lobbies.values() if lobbies is None else lobbies:
+            try:
+                lobby.pipe_conn.send(msg)
+            except (OSError, ValueError) as e:
+                # Lobby process is gone; _check_lobby_status will clean it up
+                logger.debug("Could not send auth update to lobby %s: %s", lobby.lobby_id, e)
     
     def _create_new_lobby(self, first_player: Tuple[str, Tuple[str, int]]) -> int:
         """Create a new game lobby for the waiting player."""
@@ -787,6 +848,8 @@ class LobbyManager:
             pipe_conn=parent_conn
         )
         self.lobbies[lobby_id] = lobby_info
+        # The lobby starts with everyone logged in so far; later changes are pushed
+        self._push_auth_update(adds=dict(self.authenticated_users), lobbies=[lobby_info])
         
         # Send redirect message to player
         self._send_lobby_redirect(addr, port, lobby_id)
@@ -796,14 +859,12 @@ class LobbyManager:
     
     def _find_available_port(self) -> int:
         """Find an available port for a new lobby."""
-        # Try random ports from the range
-        attempts = 0
-        while attempts < 50:  # Limit attempts to avoid infinite loop
-            port = random.randint(config.LOBBY_PORT_RANGE[0], config.LOBBY_PORT_RANGE[1])
-            
+        used = {lobby.port for lobby in self.lobbies.values()}
+        # Try random ports from the range, each at most once
+        low, high = config.LOBBY_PORT_RANGE
+        for port in random.sample(range(low, high + 1), 50):  # Limit attempts to avoid infinite loop
             # Skip if port is already in use by another lobby
-            if any(lobby.port == port for lobby in self.lobbies.values()):
-                attempts += 1
+            if port in used:
                 continue
                 
             # Try to bind to this port
@@ -814,7 +875,7 @@ class LobbyManager:
                 return port
             except OSError:
                 # Port is in use
-                attempts += 1
+                continue
         
         logger.error("Failed to find available port after 50 attempts")
         return 0
@@ -868,7 +929,7 @@ class LobbyManager:
                     logger.warning(f"User {msg.username} already authenticated from {addr}")
                 else:
                     # Login successful
-                    self.authenticated_users[addr] = msg.username
+                    self._set_authenticated(addr, msg.username)
                     logger.debug(f"Added {addr} to authenticated_users with username={msg.username}")
                     result = LoginResult(success=True, message="User authenticated")
                     self.sock.sendto(result.encode(), addr)
@@ -881,7 +942,7 @@ class LobbyManager:
                 try:
                     logger.debug(f"User {msg.username} not found, trying to create")
                     self.db.add_user(msg.username, msg.password_hash)
-                    self.authenticated_users[addr] = msg.username
+                    self._set_authenticated(addr, msg.username)
                     logger.debug(f"Added {addr} to authenticated_users with username={msg.username}")
                     result = LoginResult(success=True, message="User created")
                     self.sock.sendto(result.encode(), addr)
@@ -915,7 +976,7 @@ class LobbyManager:
             if username_exists:
                 # User exists but with different address - update the mapping
                 logger.info(f"User {msg.username} reconnecting from new address {addr}")
-                self.authenticated_users[addr] = msg.username
+                self._set_authenticated(addr, msg.username)
             else:
                 # User not authenticated at all
                 denied = Denied("authentication required")
@@ -951,8 +1012,7 @@ class LobbyManager:
     def _handle_pulse(self, msg: Pulse, addr: Tuple[str, int]):
         """Handle pulse message by updating last activity time."""
         # Send pulse response immediately
-        return_msg = Pulse(username=msg.username)
-        self.sock.sendto(return_msg.encode(), addr)
+        self.sock.sendto(_pulse_reply(msg.username), addr)
         
         # Update last activity time for this address
         if not hasattr(self, '_last_activity_times'):
@@ -989,10 +1049,8 @@ class LobbyManager:
                     logger.info(f"Player {username} (ID: {player_id}) disconnected from lobby {lobby_id}")
                     
                     # Remove from authenticated users list if address is available
-                    if addr and addr in self.authenticated_users:
-                        print(f"Removing {addr} from authenticated_users in LOBBY MANAGER")
-                        del self.authenticated_users[addr]
-                        print(f"Authenticated users after removal: {self.authenticated_users}")
+                    if addr:
+                        self._clear_authenticated(addr)
                     
                     # Remove from this lobby's player list
                     if username in lobby.players:
@@ -1003,8 +1061,6 @@ class LobbyManager:
                     if not lobby.players:
                         logger.info(f"No players left in lobby {lobby_id}, marking for cleanup")
                         lobby.status = LobbyStatus.COMPLETED
-                elif msg.get("type") == "get_authenticated_users":
-                    lobby.pipe_conn.send(self.authenticated_users)
             
             # Check if process is still alive
             if not lobby.process.is_alive():
@@ -1016,7 +1072,7 @@ class LobbyManager:
                     for addr, username in list(self.authenticated_users.items()):
                         if username == player:
                             logger.info(f"Removing {player} from authenticated users due to dead lobby")
-                            del self.authenticated_users[addr]
+                            self._clear_authenticated(addr)
                 
                 lobbies_to_remove.append(lobby_id)
                 continue
@@ -1050,15 +1106,17 @@ class LobbyManager:
         except Exception as e:
             logger.error(f"Error cleaning up lobby {lobby_id}: {e}")
         
+        # Drop the lobby first so the removals below are not pushed to its closed pipe
+        del self.lobbies[lobby_id]
+
         # Make sure any remaining players are removed from authenticated list
         for player in lobby.players:
             # Find their address in the authenticated_users dict
             for addr, username in list(self.authenticated_users.items()):
                 if username == player:
                     logger.info(f"Removing {player} from authenticated users during cleanup")
-                    del self.authenticated_users[addr]
+                    self._clear_authenticated(addr)
         
-        del self.lobbies[lobby_id]
         logger.info(f"Removed lobby {lobby_id}")
         
     def _check_waiting_players(self):
@@ -1088,7 +1146,7 @@ class LobbyManager:
                 # Also remove from authenticated users
                 if addr in self.authenticated_users:
                     logger.info(f"Removing {username} from authenticated users due to inactivity")
-                    del self.authenticated_users[addr]
+                    self._clear_authenticated(addr)
                 
                 # Remove from activity tracking
                 if addr in self._last_activity_times:
@@ -1130,13 +1188,9 @@ class LobbyManager:
         last_waiting_check_time = time.perf_counter()
         
         while True:
-            # Process incoming packets
-            try:
-                data, addr = self.sock.recvfrom(config.UDP_BUFFER_SIZE)
+            # Process every queued packet (one recvmmsg call on Linux)
+            for data, addr in self._rx.recv():
                 self._handle_packet(data, addr)
-            except BlockingIOError:
-                # No packets waiting
-                pass
                 
             # Periodically check lobby status
             now = time.perf_counter()
@@ -12,7 +12,8 @@ import multiprocessing
 # Import modules to test
 from protocol import (
     MessageType, Hello, Welcome, Input, State, Login, LoginResult,
-    Pulse, GameOver, Denied, decode
+    Pulse, GameOver, Denied, Ping, Pong, StatePacker, decode, decode_state, peek_type,
+    PROTOCOL_VERSION
 )
 from server import (
     ServerDB, GameState, PongServer, LobbyManager, PlayerSlot,
@@ -54,6 +55,21 @@ class TestProtocol(unittest.TestCase):
         self.assertEqual(decoded.username, username)
         self.assertEqual(decoded.password_hash, password_hash)
     
+    def test_input_binary_encode_decode(self):
+        """Test that Input uses the compact binary format and round-trips"""
+        msg = Input(seq=42, paddle_y=212.5)
+
+        encoded = msg.encode()
+        self.assertNotEqual(encoded[:1], b"{")
+        decoded = decode(encoded)
+
+        self.assertEqual(decoded.type, MessageType.INPUT)
+        self.assertEqual(decoded.seq, 42)
+        self.assertEqual(decoded.paddle_y, 212.5)
+
+        with self.assertRaises(ValueError):
+            decode(encoded[:-1])
+
     def test_state_encode_decode(self):
         """Test State message encoding and decoding"""
         state = State(
@@ -81,6 +97,81 @@ class TestProtocol(unittest.TestCase):
         self.assertEqual(decoded.player0_username, "player1")
         self.assertEqual(decoded.player1_username, "player2")
 
+    def test_state_binary_optional_fields(self):
+        """Test that missing usernames and signed fields survive the binary State format"""
+        state = State(1, 10.5, 20.25, 0, 420, 0, 9, player0_username=None,
+                      player1_username="spieler", ball_vx=-300.0, ack0=-1, ack1=7)
+        decoded = decode(state.encode())
+
+        self.assertEqual(decoded, state)
+        self.assertIsNone(decoded.player0_username)
+
+        with self.assertRaises(ValueError):
+            decode(state.encode()[:-2])
+
+    def test_fixed_messages_binary_round_trip(self):
+        """Test that Welcome, Ping and Pong use binary layouts and round-trip"""
+        for msg in (Welcome(player_id=1), Ping(ts=12.5), Pong(ts=99.25)):
+            encoded = msg.encode()
+            self.assertNotEqual(encoded[:1], b"{")
+            self.assertEqual(decode(encoded), msg)
+        with self.assertRaises(ValueError):
+            decode(Welcome(player_id=0).encode()[:-1])
+
+    def test_json_decode_fills_defaults_and_rejects_missing_fields(self):
+        """Test that JSON decoding applies constructor defaults and validates required fields"""
+        raw = json.dumps({"version": PROTOCOL_VERSION, "type": int(MessageType.GAME_OVER),
+                          "reason": "done"}).encode()
+        self.assertEqual(decode(raw), GameOver(reason="done"))
+
+        raw = json.dumps({"version": PROTOCOL_VERSION, "type": int(MessageType.LOGIN),
+                          "username": "a"}).encode()
+        with self.assertRaises(ValueError):
+            decode(raw)
+
+    def test_json_decode_rejects_unknown_type(self):
+        """Test that out-of-range or non-integer JSON message types are rejected"""
+        for bad_type in (len(MessageType), -1, "0", True, None):
+            raw = json.dumps({"version": PROTOCOL_VERSION, "type": bad_type, "username": "a"}).encode()
+            with self.assertRaises(ValueError):
+                decode(raw)
+
+    def test_peek_type(self):
+        """Test that binary packets expose their type without a full decode"""
+        state = State(1, 10.0, 20.0, 0, 0, 0, 0)
+        self.assertEqual(peek_type(state.encode()), MessageType.STATE)
+        self.assertEqual(peek_type(memoryview(Input(seq=3, paddle_y=1.0).encode())), MessageType.INPUT)
+        self.assertIsNone(peek_type(Hello(username="x").encode()))
+        self.assertIsNone(peek_type(b"\x04"))
+
+    def test_decode_state_fast_path(self):
+        """Test that decode_state matches decode for binary State packets"""
+        state = State(5, 1.5, 2.5, 3.0, 4.0, 1, 2, "a", None, ack0=4)
+        self.assertEqual(decode_state(state.encode()), decode(state.encode()))
+        with self.assertRaises(ValueError):
+            decode_state(b"\x00" + state.encode()[1:])
+        with self.assertRaises(ValueError):
+            decode_state(state.encode()[:10])
+
+    def test_state_packer_matches_encode(self):
+        """Test that the reused STATE buffer encodes exactly like State.encode"""
+        packer = StatePacker()
+        for args in ((1, 1.5, 2.5, 3.0, 4.0, 0, 1, "a", None, 0.5, -0.5, 3, -1),
+                     (2, 9.0, 8.0, 7.0, 6.0, 2, 1, "a", None, 1.0, 1.0, 4, -1),
+                     (3, 9.0, 8.0, 7.0, 6.0, 2, 1, "a", "bb", 1.0, 1.0, 5, 0)):
+            self.assertEqual(bytes(packer.pack(*args)), State(*args).encode())
+
+    def test_decode_from_memoryview(self):
+        """Test that packets decode straight from a receive-buffer memoryview"""
+        buf = bytearray(256)
+        for msg in (State(5, 1.5, 2.5, 3.0, 4.0, 1, 2, "a", "b"), Hello(username="user")):
+            raw = msg.encode()
+            buf[:len(raw)] = raw
+            self.assertEqual(decode(memoryview(buf)[:len(raw)]), msg)
+        raw = State(1, 0.0, 0.0, 0.0, 0.0, 0, 0).encode()
+        buf[:len(raw)] = raw
+        self.assertEqual(decode_state(memoryview(buf)[:len(raw)]), decode(raw))
+
 class TestServerDB(unittest.TestCase):
     """Test database functionality"""
     
@@ -93,6 +184,7 @@ class TestServerDB(unittest.TestCase):
     
     def tearDown(self):
         """Clean up temporary database after tests"""
+        self.db.close()
         os.unlink(self.db_path)
     
     def test_add_user(self):
@@ -116,6 +208,21 @@ class TestServerDB(unittest.TestCase):
         # Second add should fail
         with self.assertRaises(ValueError):
             self.db.add_user(username, password_hash)
+
+    def test_connection_is_reused(self):
+        """Test that queries share one connection until it is closed"""
+        conn = self.db._get_connection()
+        self.db.add_user("reuse", "hashedpw123")
+        self.assertIs(self.db._get_connection(), conn)
+        self.db.close()
+        self.assertEqual(self.db.get_stats("reuse"), (0, 0, 0))
+        self.assertIsNot(self.db._get_connection(), conn)
+
+    def test_ensure_user(self):
+        """Test that ensure_user reports duplicates without raising"""
+        self.assertTrue(self.db.ensure_user("ensured", "hashedpw123"))
+        self.assertFalse(self.db.ensure_user("ensured", "otherhash"))
+        self.assertTrue(self.db.verify_user("ensured", "hashedpw123"))
     
     def test_verify_user_correct_password(self):
         """Test verifying a user with correct credentials"""
@@ -135,7 +242,20 @@ class TestServerDB(unittest.TestCase):
         self.db.add_user(username, password_hash)
         
         self.assertFalse(self.db.verify_user(username, wrong_hash))
+        self.assertFalse(self.db.verify_user(username, "h\u00e4shedpw123"))
     
+    def test_verify_user_reuses_recent_success(self):
+        """Test that a repeated successful login skips the database query"""
+        self.db.add_user("cacheduser", "hashedpw123")
+        self.assertTrue(self.db.verify_user("cacheduser", "hashedpw123"))
+
+        with patch.object(self.db, '_execute_with_retry') as mock_exec:
+            self.assertTrue(self.db.verify_user("cacheduser", "hashedpw123"))
+            mock_exec.assert_not_called()
+            mock_exec.return_value = False
+            self.assertFalse(self.db.verify_user("cacheduser", "wrongpw456"))
+            mock_exec.assert_called_once()
+
     def test_verify_nonexistent_user(self):
         """Test verifying a user that doesn't exist"""
         username = "nonexistent"
@@ -168,6 +288,16 @@ class TestServerDB(unittest.TestCase):
         self.assertEqual(games, 1)
         self.assertEqual(wins, 0)
         self.assertEqual(losses, 1)
+
+    def test_record_games_batch(self):
+        """Test recording several outcomes in one call"""
+        self.db.add_user("user_a", "hash_a")
+        self.db.add_user("user_b", "hash_b")
+        self.db.record_games([("user_a", True), ("user_b", False), ("user_a", False)])
+        self.db.record_games([])
+
+        self.assertEqual(self.db.get_stats("user_a"), (2, 1, 1))
+        self.assertEqual(self.db.get_stats("user_b"), (1, 0, 1))
     
     def test_multiple_games(self):
         """Test recording multiple games"""
@@ -369,6 +499,15 @@ class TestPongServer(unittest.TestCase):
         self.mock_socket.sendto.assert_called_once()
         args, _ = self.mock_socket.sendto.call_args
         self.assertEqual(args[1], addr)
+
+    def test_handle_pulse_echoes_username(self):
+        """Test that a Pulse is echoed back even from an unknown address"""
+        addr = ('127.0.0.1', 5000)
+        self.server.handle_packet(Pulse(username="pulser").encode(), addr)
+
+        args, _ = self.mock_socket.sendto.call_args
+        self.assertEqual(decode(args[0]), Pulse(username="pulser"))
+        self.assertEqual(args[1], addr)
     
     def test_handle_hello_new_player(self):
         """Test handling a Hello message for a new player"""
@@ -452,6 +591,30 @@ class TestPongServer(unittest.TestCase):
         self.assertEqual(self.server.slots[0].paddle_y, 150)
         self.assertEqual(self.server.game.paddles[0], 150)
     
+    def test_handle_input_ignores_stale_seq(self):
+        """Test that a reordered, older Input does not move the paddle back"""
+        addr = ('127.0.0.1', 5000)
+        self.server.slots[0] = PlayerSlot(
+            id=0,
+            addr=addr,
+            username="testuser1",
+            last_pulse_time=time.perf_counter()
+        )
+
+        self.server._handle_input(Input(seq=5, paddle_y=150), addr)
+        self.server._handle_input(Input(seq=4, paddle_y=20), addr)
+
+        self.assertEqual(self.server.game.paddles[0], 150)
+        self.assertEqual(self.server.slots[0].last_seq, 5)
+
+        # The applied seq is acknowledged in the next State
+        self.server.broadcast_state()
+        args, _ = self.mock_socket.sendto.call_args
+        decoded_msg = decode(args[0])
+        self.assertEqual(decoded_msg.ack0, 5)
+        self.assertEqual(decoded_msg.ack1, -1)
+        self.assertEqual(decoded_msg.ball_vx, self.server.game.ball_vx)
+
     def test_handle_input_unknown_player(self):
         """Test handling an Input message from unknown player"""
         addr = ('10.0.0.1', 6000)  # Not in slots
@@ -602,6 +765,31 @@ class TestLobbyManager(unittest.TestCase):
         # Verify process was terminated or joined
         mock_process.join.assert_called_once()
 
+    def test_login_pushes_auth_update_to_lobbies(self):
+        """Test that logins and removals are pushed to running lobbies"""
+        from server import LobbyInfo
+        mock_pipe = MagicMock()
+        self.manager.lobbies[1] = LobbyInfo(
+            lobby_id=1,
+            port=10001,
+            process=MagicMock(),
+            players=[],
+            creation_time=time.perf_counter(),
+            status=LobbyStatus.WAITING,
+            pipe_conn=mock_pipe
+        )
+        addr = ('127.0.0.1', 5000)
+        with patch.object(self.manager, '_match_players'):
+            self.manager._handle_login(Login(username="testuser1", password_hash="hash1"), addr)
+        mock_pipe.send.assert_called_once_with(
+            {"type": "auth_update", "adds": {addr: "testuser1"}, "removes": []})
+
+        mock_pipe.reset_mock()
+        self.manager._clear_authenticated(addr)
+        mock_pipe.send.assert_called_once_with(
+            {"type": "auth_update", "adds": {}, "removes": [addr]})
+        del self.manager.lobbies[1]
+
 # --------------------- Integration Tests ---------------------
 class TestIntegration(unittest.TestCase):
     """Integration tests between components"""
@@ -639,18 +827,17 @@ class TestIntegration(unittest.TestCase):
                 lobby_id=1
             )
             
-            # Patch the update_authenticated_users method to prevent hanging
-            with patch.object(server, 'update_authenticated_users'):
-                # Test login with valid user
-                login_msg = Login(username="testuser1", password_hash="hash1")
-                server._handle_login(login_msg, ('127.0.0.1', 5000))
-                
-                # Verify response
-                self.server_socket.sendto.assert_called_once()
-                args, _ = self.server_socket.sendto.call_args
-                decoded_msg = decode(args[0])
-                self.assertEqual(decoded_msg.type, MessageType.LOGIN_RESULT)
-                self.assertTrue(decoded_msg.success)
+            # Test login with valid user (answered without asking the parent)
+            login_msg = Login(username="testuser1", password_hash="hash1")
+            server._handle_login(login_msg, ('127.0.0.1', 5000))
+            
+            # Verify response
+            self.server_socket.sendto.assert_called_once()
+            args, _ = self.server_socket.sendto.call_args
+            decoded_msg = decode(args[0])
+            self.assertEqual(decoded_msg.type, MessageType.LOGIN_RESULT)
+            self.assertTrue(decoded_msg.success)
+            self.assertFalse(self.pipe_parent.poll())
     
     def test_server_pipe_communication(self):
         """Test communication between server and parent process"""
@@ -679,6 +866,34 @@ class TestIntegration(unittest.TestCase):
             msg = self.pipe_parent.recv()
             self.assertEqual(msg.get('type'), 'player_disconnected')
             self.assertEqual(msg.get('username'), 'testuser1')
+
+    def test_server_applies_auth_updates(self):
+        """Test that the lobby keeps authenticated_users from parent pushes"""
+        with patch('socket.socket', return_value=self.server_socket):
+            server = PongServer(
+                host='localhost',
+                port=12345,
+                db_path=self.db_path,
+                pipe_conn=self.pipe_child,
+                lobby_id=1
+            )
+            addr = ('127.0.0.1', 5000)
+            self.pipe_parent.send({"type": "auth_update", "adds": {addr: "testuser1"}, "removes": []})
+            self.assertTrue(self.pipe_child.poll(1.0))
+            self.assertTrue(server._check_parent_messages())
+            self.assertEqual(server.authenticated_users, {addr: "testuser1"})
+
+            self.pipe_parent.send({"type": "auth_update", "adds": {}, "removes": [addr]})
+            self.assertTrue(self.pipe_child.poll(1.0))
+            server._check_parent_messages()
+            self.assertEqual(server.authenticated_users, {})
+
+            # A burst of queued messages is drained in one call
+            for port in (5001, 5002, 5003):
+                self.pipe_parent.send({"type": "auth_update", "adds": {('127.0.0.1', port): "u"}, "removes": []})
+            time.sleep(0.1)
+            self.assertTrue(server._check_parent_messages())
+            self.assertEqual(len(server.authenticated_users), 3)
     
     def test_game_state_server_integration(self):
         """Test integration between GameState and PongServer"""